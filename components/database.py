@@ -3,6 +3,14 @@ import os
 from supabase import create_client, Client
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Tables merged into each user record by get_all_users
+USER_DATA_TABLES = [
+    'profiles', 'user_roles', 'user_profiles', 'users', 'pending_signups',
+    'user_preferences', 'user_activity_logs', 'api_usage', 'chat_threads',
+    'file_uploads', 'custom_assistants'
+]
 
 @st.cache_resource
 def init_service_client():
@@ -161,8 +169,16 @@ class DatabaseManager:
     def get_all_users(self) -> List[Dict]:
         """Get all users with comprehensive data (admin only)"""
         try:
-            # Get auth users
-            auth_response = self.client.auth.admin.list_users()
+            # Fetch auth users and every table concurrently; wall time is the
+            # slowest query rather than the sum of all twelve
+            with ThreadPoolExecutor(max_workers=len(USER_DATA_TABLES) + 1) as executor:
+                auth_future = executor.submit(self.client.auth.admin.list_users)
+                table_futures = {
+                    table_name: executor.submit(self._fetch_table, table_name)
+                    for table_name in USER_DATA_TABLES
+                }
+                auth_response = auth_future.result()
+                tables_data = {name: future.result() for name, future in table_futures.items()}
             
             # Handle different response formats
             auth_users = []
@@ -173,18 +189,6 @@ class DatabaseManager:
             elif isinstance(auth_response, list):
                 auth_users = auth_response
             
-            # Get data from all tables
-            tables_data = {}
-            
-            for table_name in ['profiles', 'user_roles', 'user_profiles', 'users', 'pending_signups', 
-                             'user_preferences', 'user_activity_logs', 'api_usage', 'chat_threads', 
-                             'file_uploads', 'custom_assistants']:
-                try:
-                    response = self.client.table(table_name).select("*").execute()
-                    tables_data[table_name] = response.data if response.data else []
-                except:
-                    tables_data[table_name] = []
-            
             # Process and combine user data
             users = []
             for user in auth_users:
@@ -208,6 +212,14 @@ class DatabaseManager:
             st.error(f"Error fetching users: {str(e)}")
             return []
     
+    def _fetch_table(self, table_name: str) -> List[Dict]:
+        """Select every row of a table, or an empty list if it is unavailable"""
+        try:
+            response = self.client.table(table_name).select("*").execute()
+            return response.data if response.data else []
+        except Exception:
+            return []
+    
     def _combine_user_data(self, auth_user, tables_data: Dict) -> Dict:
         """Combine user data from multiple tables"""
         user_id = getattr(auth_user, 'id', '')
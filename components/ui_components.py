@@ -1,10 +1,11 @@
 import streamlit as st
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
-def load_custom_css():
-    """Load custom CSS styling for the application"""
-    st.markdown("""
+@st.cache_data(show_spinner=False)
+def _build_custom_css() -> str:
+    """Build the custom CSS block once and reuse it across reruns"""
+    return """
     <style>
     /* Main theme colors - Light Green */
     .main {
@@ -271,7 +272,11 @@ def load_custom_css():
         }
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+def load_custom_css():
+    """Load custom CSS styling for the application"""
+    st.markdown(_build_custom_css(), unsafe_allow_html=True)
 
 def show_loading_spinner(text: str = "Loading..."):
     """Display a loading spinner with text"""
@@ -300,13 +305,31 @@ def show_alert(message: str, alert_type: str = "info"):
     </div>
     """, unsafe_allow_html=True)
 
+def _metric_card_html(title: str, value: str, subtitle: str = "", color: str = "#2e7d32") -> str:
+    """Build the HTML for a single metric card"""
+    subtitle_html = f'<small style="color: #888;">{subtitle}</small>' if subtitle else ''
+    return f"""
+    <div class="stats-card">
+        <div class="metric-value" style="color: {color};">{value}</div>
+        <div class="metric-label">{title}</div>{subtitle_html}
+    </div>
+    """.strip()
+
 def create_metric_card(title: str, value: str, subtitle: str = "", color: str = "#2e7d32"):
     """Create a metric card component"""
+    st.markdown(_metric_card_html(title, value, subtitle, color), unsafe_allow_html=True)
+
+def create_metric_grid(cards: List[Dict], columns: Optional[int] = None):
+    """Render several metric cards as one CSS grid in a single markdown call
+    
+    Each card is a dict with the create_metric_card arguments
+    (title, value, and optionally subtitle and color).
+    """
+    columns = columns or len(cards)
+    cards_html = "\n".join(_metric_card_html(**card) for card in cards)
     st.markdown(f"""
-    <div class="stats-card">
-        <div class="metric-value" style="color: {color};">{value}</div>
-        <div class="metric-label">{title}</div>
-        {f'<small style="color: #888;">{subtitle}</small>' if subtitle else ''}
+    <div style="display: grid; grid-template-columns: repeat({columns}, 1fr); gap: 1rem;">
+    {cards_html}
     </div>
     """, unsafe_allow_html=True)
 
@@ -490,6 +513,39 @@ def show_confirmation_dialog(message: str, key: str) -> bool:
         st.session_state[f"confirm_{key}"] = False
         return True
 
+# Session key holding the (message, alert_type) a confirmed dialog left for the page
+_DIALOG_RESULT_KEY = "confirm_dialog_result"
+
+@st.dialog("Confirm")
+def confirm_dialog(message: str, on_confirm: Callable[[], Optional[Tuple[str, str]]]):
+    """Show a modal confirmation dialog and run on_confirm when confirmed
+    
+    Unlike show_confirmation_dialog, the confirm click only reruns the dialog
+    itself rather than the whole page. on_confirm may return a
+    (message, alert_type) pair, which show_dialog_result renders on the page
+    once the dialog has closed.
+    """
+    st.warning(f"⚠️ {message}")
+    col1, col2 = st.columns(2)
+    with col1:
+        confirmed = st.button("✅ Confirm", use_container_width=True)
+    with col2:
+        if st.button("❌ Cancel", use_container_width=True):
+            st.rerun()
+    
+    if confirmed:
+        result = on_confirm()
+        if result:
+            st.session_state[_DIALOG_RESULT_KEY] = result
+        # Close the dialog so the action can't be confirmed twice
+        st.rerun()
+
+def show_dialog_result():
+    """Render and clear the message left by the last confirmed dialog, if any"""
+    result = st.session_state.pop(_DIALOG_RESULT_KEY, None)
+    if result:
+        show_alert(*result)
+
 def format_number(number: float, format_type: str = "default") -> str:
     """Format numbers for display"""
     if format_type == "currency":
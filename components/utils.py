@@ -2,8 +2,9 @@ import streamlit as st
 import re
 import hashlib
 import uuid
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
 from datetime import datetime, timedelta
+from functools import lru_cache
 import json
 
 def validate_email(email: str) -> bool:
@@ -92,14 +93,16 @@ def format_file_size(size_bytes: int) -> str:
     
     return f"{size_bytes:.1f} {size_names[i]}"
 
+@lru_cache(maxsize=32)
 def calculate_usage_percentage(used: int, limit: int) -> float:
     """Calculate usage percentage"""
     if limit == 0:
         return 0.0
     return min((used / limit) * 100, 100.0)
 
+@lru_cache(maxsize=8)
 def get_subscription_limits(tier: str) -> Dict[str, int]:
-    """Get subscription limits based on tier"""
+    """Get subscription limits based on tier (cached, treat as read-only)"""
     limits = {
         'free': {
             'monthly_tokens': 10000,
@@ -162,6 +165,34 @@ def time_ago(date_string: str) -> str:
     except Exception:
         return "Unknown"
 
+def calculate_activity_scores(last_sign_ins: Sequence[str], now: Optional[datetime] = None):
+    """Vectorized calculate_activity_score over many sign-in timestamps, as a NumPy array"""
+    import numpy as np
+    import pandas as pd
+    
+    raw = pd.Series(last_sign_ins, dtype=object).fillna('')
+    parsed = pd.to_datetime(raw, errors='coerce', utc=True, format='ISO8601')
+    
+    # One shared "now" for the whole batch
+    now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+    now = now.tz_localize('UTC') if now.tzinfo is None else now.tz_convert('UTC')
+    
+    age_days = (now - parsed).dt.days
+    days = age_days.fillna(0).astype(np.int64)
+    return np.select(
+        [
+            raw.eq(''), age_days.isna(),
+            days.eq(0), days.eq(1), days.le(7), days.le(30), days.le(365)
+        ],
+        [
+            "Never", "Unknown", "Today", "Yesterday",
+            days.astype(str) + " days ago",
+            (days // 7).astype(str) + " weeks ago",
+            (days // 30).astype(str) + " months ago"
+        ],
+        default=(days // 365).astype(str) + " years ago"
+    )
+
 def truncate_text(text: str, max_length: int = 100) -> str:
     """Truncate text to specified length"""
     if not text:
@@ -340,15 +371,14 @@ def check_rate_limit(user_id: str, action: str, limit: int = 10, window_minutes:
     rate_data['count'] += 1
     return True
 
-def get_user_avatar_url(user: Dict) -> str:
-    """Get user avatar URL or generate a default one"""
-    avatar_url = user.get('avatar_url')
-    
+@lru_cache(maxsize=1024)
+def get_user_avatar_url(email: str, full_name: str = "", avatar_url: str = "") -> str:
+    """Get user avatar URL or generate a default one (memoized per user)"""
     if avatar_url:
         return avatar_url
     
     # Generate a default avatar based on user's name or email
-    name = user.get('full_name', user.get('email', 'User'))
+    name = full_name or email or 'User'
     initials = ''.join([word[0].upper() for word in name.split()[:2]])
     
     # Use a service like UI Avatars or generate a simple colored background
@@ -1,9 +1,4 @@
 import streamlit as st
-import sys
-import os
-
-# Add the parent directory to the path to import components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from components.auth import AuthManager
 from components.database import DatabaseManager
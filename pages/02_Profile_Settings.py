@@ -1,15 +1,10 @@
 import streamlit as st
-import sys
-import os
-
-# Add the parent directory to the path to import components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from components.auth import AuthManager
 from components.database import DatabaseManager
 from components.ui_components import (
     load_custom_css, show_alert, create_dashboard_card, 
-    show_confirmation_dialog, safe_date_format
+    confirm_dialog, show_dialog_result, safe_date_format
 )
 from components.utils import (
     validate_email, validate_password, sanitize_input, 
@@ -51,6 +46,9 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    # Outcome of a confirmed dialog from the previous run
+    show_dialog_result()
+    
     # Main content in tabs
     tab1, tab2, tab3, tab4 = st.tabs(["👤 Personal Info", "🔒 Security", "⚙️ Preferences", "📊 Account Details"])
     
@@ -75,7 +73,11 @@ def show_personal_info_section(user_data: Dict, db: DatabaseManager, user_id: st
     
     with col1:
         # Avatar section
-        avatar_url = get_user_avatar_url(user_data)
+        avatar_url = get_user_avatar_url(
+            user_data.get('email', ''),
+            user_data.get('full_name', ''),
+            user_data.get('avatar_url', '')
+        )
         st.markdown(f"""
         <div style="text-align: center; padding: 20px;">
             <img src="{avatar_url}" style="width: 120px; height: 120px; border-radius: 50%; border: 3px solid #4caf50;">
@@ -276,9 +278,11 @@ def show_security_section(user_data: Dict, auth_manager: AuthManager):
         show_alert("Two-factor authentication is enabled for your account.", "success")
         
         if st.button("🔓 Disable Two-Factor Authentication"):
-            if show_confirmation_dialog("Are you sure you want to disable two-factor authentication?", "disable_2fa"):
-                st.info("Two-factor authentication disabled.")
-                # Implementation would go here
+            # Implementation would go in the confirm callback
+            confirm_dialog(
+                "Are you sure you want to disable two-factor authentication?",
+                on_confirm=lambda: ("Two-factor authentication disabled.", "info")
+            )
     else:
         show_alert("Two-factor authentication is not enabled. Enable it for better security.", "warning")
         
@@ -290,23 +294,19 @@ def show_security_section(user_data: Dict, auth_manager: AuthManager):
     # Account security info
     st.markdown("#### 🔍 Account Security")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown(f"""
+    # Render both cards side by side in one grid instead of two columns
+    st.markdown(f"""
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;">
         <div class="feature-card">
             <strong>📅 Account Created</strong><br>
             <span style="color: #666;">{safe_date_format(user_data.get('created_at', ''), '%B %d, %Y')}</span>
         </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
         <div class="feature-card">
             <strong>🕐 Last Login</strong><br>
             <span style="color: #666;">{safe_date_format(user_data.get('last_sign_in_at', ''), '%B %d, %Y at %I:%M %p')}</span>
         </div>
-        """, unsafe_allow_html=True)
+    </div>
+    """, unsafe_allow_html=True)
     
     # Email verification status
     email_verified = user_data.get('email_confirmed_at') is not None
@@ -464,29 +464,34 @@ def show_account_details_section(user_data: Dict):
         subscription_tier = user_data.get('subscription_tier', 'free').title()
         subscription_status = user_data.get('subscription_status', 'active').title()
         
-        st.markdown(f"""
+        html = f"""
         <div class="feature-card">
             <strong>Current Plan:</strong> {subscription_tier}<br>
             <strong>Status:</strong> {subscription_status}<br>
             <strong>Billing Cycle:</strong> Monthly<br>
             <strong>Next Billing:</strong> {safe_date_format(user_data.get('subscription_end_date', ''), '%B %d, %Y')}
         </div>
-        """, unsafe_allow_html=True)
+        """
         
-        if user_data.get('subscription_tier') == 'free':
-            st.markdown("#### 🌟 Upgrade Benefits")
-            st.markdown("""
-            <div class="feature-card" style="border-left-color: #ffc107;">
-                <strong>Pro Plan Benefits:</strong><br>
-                • 100,000 tokens/month<br>
-                • 50 file uploads<br>
-                • 100 chat threads<br>
-                • Priority support<br>
-                • Advanced features<br>
-                • Custom assistants
-            </div>
-            """, unsafe_allow_html=True)
-            
+        is_free_tier = user_data.get('subscription_tier') == 'free'
+        if is_free_tier:
+            # Upgrade pitch directly follows the plan card, so emit both in one call
+            html += """
+        <h4>🌟 Upgrade Benefits</h4>
+        <div class="feature-card" style="border-left-color: #ffc107;">
+            <strong>Pro Plan Benefits:</strong><br>
+            • 100,000 tokens/month<br>
+            • 50 file uploads<br>
+            • 100 chat threads<br>
+            • Priority support<br>
+            • Advanced features<br>
+            • Custom assistants
+        </div>
+        """
+        
+        st.markdown(html, unsafe_allow_html=True)
+        
+        if is_free_tier:
             if st.button("⬆️ Upgrade to Pro", use_container_width=True):
                 st.info("Upgrade functionality would redirect to billing page")
     
@@ -513,32 +518,29 @@ def show_account_details_section(user_data: Dict):
         
         with col2b:
             if st.button("🗑️ Delete Account", use_container_width=True, type="secondary"):
-                if show_confirmation_dialog("Are you sure you want to delete your account? This action cannot be undone.", "delete_account"):
-                    st.error("Account deletion would be processed here")
+                confirm_dialog(
+                    "Are you sure you want to delete your account? This action cannot be undone.",
+                    on_confirm=lambda: ("Account deletion would be processed here", "error")
+                )
     
     # Account ID and technical details
     st.markdown("---")
     st.markdown("#### 🔧 Technical Details")
     
-    col3, col4 = st.columns(2)
-    
-    with col3:
-        st.markdown(f"""
+    st.markdown(f"""
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;">
         <div class="feature-card">
             <strong>Account ID:</strong> {user_data.get('id', 'N/A')}<br>
             <strong>Email Verified:</strong> {'Yes' if user_data.get('email_confirmed_at') else 'No'}<br>
             <strong>Account Created:</strong> {safe_date_format(user_data.get('created_at', ''), '%B %d, %Y')}
         </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(f"""
         <div class="feature-card">
             <strong>Last Login:</strong> {safe_date_format(user_data.get('last_sign_in_at', ''), '%B %d, %Y')}<br>
             <strong>Profile Updated:</strong> {safe_date_format(user_data.get('updated_at', ''), '%B %d, %Y')}<br>
             <strong>Role:</strong> {user_data.get('role', 'user').title()}
         </div>
-        """, unsafe_allow_html=True)
+    </div>
+    """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
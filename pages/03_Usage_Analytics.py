@@ -1,15 +1,12 @@
 import streamlit as st
-import sys
-import os
-
-# Add the parent directory to the path to import components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bisect
+from itertools import islice
 
 from components.auth import AuthManager
 from components.database import DatabaseManager
 from components.ui_components import (
-    load_custom_css, create_metric_card, create_progress_bar,
-    safe_date_format, time_ago
+    load_custom_css, create_metric_grid, create_progress_bar,
+    time_ago
 )
 from components.utils import (
     calculate_usage_percentage, get_subscription_limits,
@@ -17,10 +14,22 @@ from components.utils import (
 )
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+import plotly.io as pio
+import numpy as np
 import pandas as pd
 from typing import Dict, List
 
+try:
+    from plotly_resampler import FigureResampler
+except ImportError:  # Optional: charts are sent unsampled without it
+    FigureResampler = None
+
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:  # Optional: figures are serialized with stdlib json without it
+    pass
+
 # Page configuration
 st.set_page_config(
     page_title="Usage Analytics",
@@ -28,6 +37,97 @@ st.set_page_config(
     layout="wide"
 )
 
+# Static page markup
+_HEADER_HTML = """
+<div style="text-align: center; padding: 1rem 0 2rem 0;">
+    <h1 style="color: #2e7d32; margin-bottom: 0.5rem;">📊 Usage Analytics</h1>
+    <p style="color: #666; font-size: 1.1rem;">Detailed insights into your platform usage and activity</p>
+</div>
+"""
+
+_FREE_PLAN_TIP_HTML = """
+<div class="feature-card" style="border-left-color: #ffc107;">
+    <strong>💡 Cost Optimization Tip:</strong><br>
+    You're on the free plan. Consider upgrading to Pro for better value at higher usage levels.
+</div>
+"""
+
+_RETENTION_HTML = """
+<div class="feature-card">
+    <strong>Data Retention Policy:</strong><br>
+    • Activity logs: 1 year<br>
+    • Usage statistics: 2 years<br>
+    • Cost data: 7 years (for tax purposes)<br>
+    • Personal data: Until account deletion<br><br>
+    <strong>Privacy:</strong><br>
+    Your data is encrypted and never shared with third parties. 
+    You can request data deletion at any time from your profile settings.
+</div>
+"""
+
+# Usage colour tiers: green below 80%, orange below 95%, red above
+_COLOR_BREAKS = (80, 95)
+_COLORS = ('#4caf50', '#ff9800', '#f44336')
+
+def _tier_color(pct: float) -> str:
+    """Colour for a usage percentage"""
+    return _COLORS[bisect.bisect_right(_COLOR_BREAKS, pct)]
+
+# Shared chart styling, layered over the stock plotly template
+pio.templates['app'] = go.layout.Template(layout=dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(color='#333')
+))
+_TEMPLATE = 'plotly+app'
+
+# Shared st.plotly_chart config (no modebar assets shipped to the browser)
+_CHART_CONFIG = {'staticPlot': False, 'displayModeBar': False}
+
+# Sample hourly/weekly usage patterns
+_HOURS = list(range(24))
+_HOURLY_USAGE = np.array([max(0, 100 + 50 * abs(12 - h) + (h % 3) * 20) for h in _HOURS])
+_DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+_WEEKLY_USAGE = np.array([80, 90, 85, 95, 88, 60, 45])
+
+# Plan comparison table (static, rendered once at import)
+_PLANS_TABLE_HTML = pd.DataFrame({
+    'Plan': ['Free', 'Pro', 'Enterprise'],
+    'Monthly Cost': ['$0', '$29', '$99'],
+    'Tokens Included': ['10K', '100K', '1M'],
+    'Cost per Extra Token': ['N/A', '$0.001', '$0.0005']
+}).to_html(index=False, classes='plan-table')
+
+@st.cache_resource
+def _auth() -> AuthManager:
+    """Shared auth manager instance"""
+    return AuthManager()
+
+@st.cache_resource
+def _db() -> DatabaseManager:
+    """Shared database manager instance"""
+    return DatabaseManager()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _usage_stats(user_id: str) -> Dict:
+    """Get user usage statistics, cached across reruns"""
+    return _db().get_user_usage_stats(user_id)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _activity_logs(user_id: str, limit: int) -> List[Dict]:
+    """Get user activity logs, cached across reruns"""
+    return _db().get_user_activity_logs(user_id, limit=limit)
+
+def _has_usage(usage_stats: Dict) -> bool:
+    """Whether any tokens, requests or cost have been recorded"""
+    return any(usage_stats.get(k) for k in ('total_tokens', 'total_requests', 'total_cost'))
+
+def _downsample(fig: go.Figure) -> go.Figure:
+    """Wrap a line/area figure so the browser only receives a downsampled view"""
+    if FigureResampler is None:
+        return fig
+    return FigureResampler(fig, default_n_shown_samples=500)
+
 def main():
     """Main usage analytics page"""
     
@@ -35,7 +135,7 @@ def main():
     load_custom_css()
     
     # Initialize auth manager
-    auth_manager = AuthManager()
+    auth_manager = _auth()
     
     # Require authentication
     auth_manager.require_auth()
@@ -45,113 +145,110 @@ def main():
     user_id = auth_manager.get_current_user_id()
     user_role = auth_manager.get_current_user_role()
     
-    # Initialize database manager
-    db = DatabaseManager()
-    
     # Page header
-    st.markdown(f"""
-    <div style="text-align: center; padding: 1rem 0 2rem 0;">
-        <h1 style="color: #2e7d32; margin-bottom: 0.5rem;">📊 Usage Analytics</h1>
-        <p style="color: #666; font-size: 1.1rem;">Detailed insights into your platform usage and activity</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
+    
+    # Refresh button busts the cached statistics
+    col_refresh1, col_refresh2 = st.columns([5, 1])
+    with col_refresh2:
+        if st.button("🔄 Refresh Data", use_container_width=True):
+            _usage_stats.clear()
+            _activity_logs.clear()
     
     # Get user statistics
-    usage_stats = db.get_user_usage_stats(user_id) if user_id else {}
-    activity_logs = db.get_user_activity_logs(user_id, limit=100) if user_id else []
+    usage_stats = _usage_stats(user_id) if user_id else {}
+    activity_logs = _activity_logs(user_id, 100) if user_id else []
+    
+    # Shared frame of activity logs so each tab aggregates with pandas
+    logs_df = pd.DataFrame(activity_logs)
+    for column in ('activity_type', 'created_at'):
+        if column not in logs_df:
+            logs_df[column] = None
+    logs_df['activity_type'] = logs_df['activity_type'].fillna('Unknown')
+    raw_times = logs_df['created_at'].astype(object)
+    missing_time = raw_times.isna() | raw_times.eq('')
+    logs_df['_pretty_time'] = pd.to_datetime(
+        raw_times, format='ISO8601', errors='coerce', utc=True
+    ).dt.strftime('%B %d, %Y at %I:%M %p').fillna('Invalid date').mask(missing_time, 'Not set')
+    activity_counts = logs_df['activity_type'].value_counts()
+    subscription_tier = user_data.get('subscription_tier', 'free')
     
     # Main analytics sections
-    show_usage_overview(user_data, usage_stats)
+    show_usage_overview(subscription_tier, usage_stats)
     
     st.markdown("---")
     
-    # Analytics tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 Usage Trends", "💰 Cost Analysis", "🔄 Activity Timeline", "📋 Detailed Reports"])
-    
-    with tab1:
-        show_usage_trends(user_data, usage_stats, activity_logs)
-    
-    with tab2:
-        show_cost_analysis(user_data, usage_stats)
-    
-    with tab3:
-        show_activity_timeline(activity_logs)
+    # Analytics sections (st.tabs would execute every tab body on each rerun,
+    # so only the selected section is rendered)
+    active_tab = st.radio(
+        "Analytics section",
+        options=["📈 Usage Trends", "💰 Cost Analysis", "🔄 Activity Timeline", "📋 Detailed Reports"],
+        horizontal=True,
+        key="active_analytics_tab",
+        label_visibility="collapsed"
+    )
     
-    with tab4:
-        show_detailed_reports(user_data, usage_stats, activity_logs)
+    if active_tab == "📈 Usage Trends":
+        show_usage_trends(usage_stats, activity_counts)
+    elif active_tab == "💰 Cost Analysis":
+        show_cost_analysis(subscription_tier, usage_stats)
+    elif active_tab == "🔄 Activity Timeline":
+        show_activity_timeline(activity_logs, logs_df)
+    else:
+        show_detailed_reports(usage_stats, logs_df)
 
-def show_usage_overview(user_data: Dict, usage_stats: Dict):
+def show_usage_overview(subscription_tier: str, usage_stats: Dict):
     """Show usage overview with key metrics"""
     
     st.markdown("### 📊 Usage Overview")
     
     # Get subscription limits
-    subscription_tier = user_data.get('subscription_tier', 'free')
     limits = get_subscription_limits(subscription_tier)
     
-    # Calculate usage percentages
-    token_usage = calculate_usage_percentage(
-        usage_stats.get('total_tokens', 0), 
-        limits['monthly_tokens']
-    )
-    
-    file_usage = calculate_usage_percentage(
-        usage_stats.get('file_uploads_count', 0), 
-        limits['max_files']
-    )
-    
-    thread_usage = calculate_usage_percentage(
-        usage_stats.get('chat_threads_count', 0), 
-        limits['max_threads']
-    )
-    
-    assistant_usage = calculate_usage_percentage(
-        usage_stats.get('custom_assistants_count', 0), 
-        limits['max_assistants']
-    )
+    # Calculate all usage percentages in one batch (capped at 100%, 0 when no limit)
+    used = np.array([
+        usage_stats.get(key, 0)
+        for key in ('total_tokens', 'file_uploads_count', 'chat_threads_count', 'custom_assistants_count')
+    ], dtype=np.float64)
+    caps = np.array([
+        limits['monthly_tokens'], limits['max_files'], limits['max_threads'], limits['max_assistants']
+    ], dtype=np.float64)
+    usage_pct = np.minimum(np.divide(used, caps, out=np.zeros_like(used), where=caps > 0) * 100, 100.0)
+    token_usage, file_usage, thread_usage, assistant_usage = usage_pct.tolist()
     
     # Main metrics
-    col1, col2, col3, col4, col5 = st.columns(5)
-    
-    with col1:
-        create_metric_card(
-            "Total Tokens",
-            f"{usage_stats.get('total_tokens', 0):,}",
-            f"of {limits['monthly_tokens']:,}",
-            "#4caf50" if token_usage < 80 else "#ff9800" if token_usage < 95 else "#f44336"
-        )
-    
-    with col2:
-        create_metric_card(
-            "API Requests",
-            f"{usage_stats.get('total_requests', 0):,}",
-            "This month",
-            "#2e7d32"
-        )
-    
-    with col3:
-        create_metric_card(
-            "Total Cost",
-            format_currency(usage_stats.get('total_cost', 0)),
-            "This month",
-            "#4caf50"
-        )
-    
-    with col4:
-        create_metric_card(
-            "Chat Threads",
-            str(usage_stats.get('chat_threads_count', 0)),
-            f"of {limits['max_threads']} max",
-            "#4caf50" if thread_usage < 80 else "#ff9800"
-        )
-    
-    with col5:
-        create_metric_card(
-            "File Uploads",
-            str(usage_stats.get('file_uploads_count', 0)),
-            f"of {limits['max_files']} max",
-            "#4caf50" if file_usage < 80 else "#ff9800"
-        )
+    create_metric_grid([
+        {
+            'title': "Total Tokens",
+            'value': f"{usage_stats.get('total_tokens', 0):,}",
+            'subtitle': f"of {limits['monthly_tokens']:,}",
+            'color': _tier_color(token_usage)
+        },
+        {
+            'title': "API Requests",
+            'value': f"{usage_stats.get('total_requests', 0):,}",
+            'subtitle': "This month",
+            'color': "#2e7d32"
+        },
+        {
+            'title': "Total Cost",
+            'value': format_currency(usage_stats.get('total_cost', 0)),
+            'subtitle': "This month",
+            'color': "#4caf50"
+        },
+        {
+            'title': "Chat Threads",
+            'value': str(usage_stats.get('chat_threads_count', 0)),
+            'subtitle': f"of {limits['max_threads']} max",
+            'color': _tier_color(thread_usage)
+        },
+        {
+            'title': "File Uploads",
+            'value': str(usage_stats.get('file_uploads_count', 0)),
+            'subtitle': f"of {limits['max_files']} max",
+            'color': _tier_color(file_usage)
+        }
+    ])
     
     # Usage progress bars
     st.markdown("#### 📈 Resource Usage")
@@ -162,118 +259,110 @@ def show_usage_overview(user_data: Dict, usage_stats: Dict):
         create_progress_bar(
             token_usage,
             f"Token Usage ({usage_stats.get('total_tokens', 0):,} / {limits['monthly_tokens']:,})",
-            "#4caf50" if token_usage < 80 else "#ff9800" if token_usage < 95 else "#f44336"
+            _tier_color(token_usage)
         )
         
         create_progress_bar(
             file_usage,
             f"File Storage ({usage_stats.get('file_uploads_count', 0)} / {limits['max_files']})",
-            "#4caf50" if file_usage < 80 else "#ff9800"
+            _tier_color(file_usage)
         )
     
     with col2:
         create_progress_bar(
             thread_usage,
             f"Chat Threads ({usage_stats.get('chat_threads_count', 0)} / {limits['max_threads']})",
-            "#4caf50" if thread_usage < 80 else "#ff9800"
+            _tier_color(thread_usage)
         )
         
         create_progress_bar(
             assistant_usage,
             f"Custom Assistants ({usage_stats.get('custom_assistants_count', 0)} / {limits['max_assistants']})",
-            "#4caf50" if assistant_usage < 80 else "#ff9800"
+            _tier_color(assistant_usage)
         )
 
-def show_usage_trends(user_data: Dict, usage_stats: Dict, activity_logs: List[Dict]):
+def show_usage_trends(usage_stats: Dict, activity_counts: pd.Series):
     """Show usage trends and patterns"""
     
     st.markdown("### 📈 Usage Trends")
     
+    # Nothing to chart for a brand-new account
+    if not _has_usage(usage_stats) and activity_counts.empty:
+        st.info("No usage data yet. Start using the platform to see your usage trends!")
+        return
+    
     # Generate sample data for demonstration
     # In a real application, this would come from actual usage data
-    dates = [(datetime.now() - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(30, 0, -1)]
+    date_index = pd.date_range(
+        end=pd.Timestamp.now().normalize() - pd.Timedelta(days=1), periods=30
+    )
+    dates = date_index.strftime('%Y-%m-%d').tolist()
+    i = np.arange(30)
     
     # Token usage trend
     base_usage = usage_stats.get('total_tokens', 0) // 30
-    token_usage_daily = [max(0, base_usage + (i % 7) * 100 + (i % 3) * 50) for i in range(30)]
+    token_usage_daily = np.maximum(0, base_usage + (i % 7) * 100 + (i % 3) * 50)
     
     # API requests trend
     base_requests = usage_stats.get('total_requests', 0) // 30
-    api_requests_daily = [max(0, base_requests + (i % 5) * 10 + (i % 2) * 5) for i in range(30)]
+    api_requests_daily = np.maximum(0, base_requests + (i % 5) * 10 + (i % 2) * 5)
     
     # Cost trend
-    cost_daily = [usage_stats.get('total_cost', 0) / 30 * (1 + (i % 7) * 0.1) for i in range(30)]
+    cost_daily = usage_stats.get('total_cost', 0) / 30 * (1 + (i % 7) * 0.1)
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Token usage chart
         fig_tokens = px.line(
-            x=dates,
+            x=date_index,
             y=token_usage_daily,
             title="Daily Token Usage (Last 30 Days)",
-            labels={'x': 'Date', 'y': 'Tokens Used'}
-        )
-        fig_tokens.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#333'),
-            showlegend=False
+            labels={'x': 'Date', 'y': 'Tokens Used'},
+            render_mode='webgl',
+            template=_TEMPLATE
         )
         fig_tokens.update_traces(line_color='#4caf50', line_width=3)
-        st.plotly_chart(fig_tokens, use_container_width=True)
+        fig_tokens = _downsample(fig_tokens)
+        st.plotly_chart(fig_tokens, use_container_width=True, config=_CHART_CONFIG)
         
-        # Cost trend chart
-        fig_cost = px.area(
-            x=dates,
+        # Cost trend chart (px.area has no WebGL mode, so build the trace directly)
+        fig_cost = go.Figure(go.Scattergl(
+            x=date_index,
             y=cost_daily,
-            title="Daily Cost Trend (Last 30 Days)",
-            labels={'x': 'Date', 'y': 'Cost ($)'}
-        )
+            mode='lines',
+            fill='tozeroy',
+            fillcolor='rgba(76, 175, 80, 0.3)',
+            line_color='#4caf50'
+        ))
         fig_cost.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#333'),
-            showlegend=False
+            title="Daily Cost Trend (Last 30 Days)",
+            xaxis_title='Date',
+            yaxis_title='Cost ($)',
+            template=_TEMPLATE
         )
-        fig_cost.update_traces(fill='tonexty', fillcolor='rgba(76, 175, 80, 0.3)', line_color='#4caf50')
-        st.plotly_chart(fig_cost, use_container_width=True)
+        fig_cost = _downsample(fig_cost)
+        st.plotly_chart(fig_cost, use_container_width=True, config=_CHART_CONFIG)
     
     with col2:
-        # API requests chart
-        fig_requests = px.bar(
-            x=dates[-7:],  # Last 7 days
-            y=api_requests_daily[-7:],
-            title="API Requests (Last 7 Days)",
-            labels={'x': 'Date', 'y': 'Requests'}
+        # API requests chart (native chart, too few bars to need Plotly)
+        st.markdown("**API Requests (Last 7 Days)**")
+        st.bar_chart(
+            pd.DataFrame({'Requests': api_requests_daily[-7:]}, index=dates[-7:]),  # Last 7 days
+            x_label='Date',
+            y_label='Requests',
+            color='#4caf50'
         )
-        fig_requests.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#333'),
-            showlegend=False
-        )
-        fig_requests.update_traces(marker_color='#4caf50')
-        st.plotly_chart(fig_requests, use_container_width=True)
         
         # Activity distribution
-        if activity_logs:
-            activity_types = {}
-            for log in activity_logs:
-                activity_type = log.get('activity_type', 'Unknown')
-                activity_types[activity_type] = activity_types.get(activity_type, 0) + 1
-            
+        if not activity_counts.empty:
             fig_activity = px.pie(
-                values=list(activity_types.values()),
-                names=list(activity_types.keys()),
-                title="Activity Distribution"
-            )
-            fig_activity.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333')
+                values=activity_counts.values,
+                names=activity_counts.index.tolist(),
+                title="Activity Distribution",
+                template=_TEMPLATE
             )
-            st.plotly_chart(fig_activity, use_container_width=True)
+            st.plotly_chart(fig_activity, use_container_width=True, config=_CHART_CONFIG)
         else:
             st.info("No activity data available yet.")
     
@@ -284,45 +373,33 @@ def show_usage_trends(user_data: Dict, usage_stats: Dict, activity_logs: List[Di
     
     with col3:
         # Hourly usage pattern (sample data)
-        hours = list(range(24))
-        hourly_usage = [max(0, 100 + 50 * abs(12 - h) + (h % 3) * 20) for h in hours]
-        
-        fig_hourly = px.bar(
-            x=hours,
-            y=hourly_usage,
-            title="Usage by Hour of Day",
-            labels={'x': 'Hour', 'y': 'Activity Level'}
-        )
-        fig_hourly.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#333'),
-            showlegend=False
+        st.markdown("**Usage by Hour of Day**")
+        st.bar_chart(
+            pd.DataFrame({'Activity Level': _HOURLY_USAGE}, index=_HOURS),
+            x_label='Hour',
+            y_label='Activity Level',
+            color='#4caf50'
         )
-        fig_hourly.update_traces(marker_color='#4caf50')
-        st.plotly_chart(fig_hourly, use_container_width=True)
     
     with col4:
-        # Weekly usage pattern (sample data)
-        days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        weekly_usage = [80, 90, 85, 95, 88, 60, 45]
-        
-        fig_weekly = px.bar(
-            x=days,
-            y=weekly_usage,
-            title="Usage by Day of Week",
-            labels={'x': 'Day', 'y': 'Activity Level'}
-        )
+        # Weekly usage pattern (sample data); kept on Plotly because
+        # st.bar_chart would sort the day names alphabetically
+        fig_weekly = go.Figure(go.Bar(
+            x=_DAYS,
+            y=_WEEKLY_USAGE,
+            marker_color='#4caf50',
+            marker_line_width=0
+        ))
         fig_weekly.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#333'),
-            showlegend=False
+            title="Usage by Day of Week",
+            xaxis_title='Day',
+            yaxis_title='Activity Level',
+            template=_TEMPLATE,
+            uirevision='usage_patterns'
         )
-        fig_weekly.update_traces(marker_color='#4caf50')
-        st.plotly_chart(fig_weekly, use_container_width=True)
+        st.plotly_chart(fig_weekly, use_container_width=True, config=_CHART_CONFIG)
 
-def show_cost_analysis(user_data: Dict, usage_stats: Dict):
+def show_cost_analysis(subscription_tier: str, usage_stats: Dict):
     """Show detailed cost analysis"""
     
     st.markdown("### 💰 Cost Analysis")
@@ -345,14 +422,10 @@ def show_cost_analysis(user_data: Dict, usage_stats: Dict):
             fig_breakdown = px.pie(
                 values=list(cost_breakdown.values()),
                 names=list(cost_breakdown.keys()),
-                title="Cost Breakdown This Month"
+                title="Cost Breakdown This Month",
+                template=_TEMPLATE
             )
-            fig_breakdown.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333')
-            )
-            st.plotly_chart(fig_breakdown, use_container_width=True)
+            st.plotly_chart(fig_breakdown, use_container_width=True, config=_CHART_CONFIG)
         
         with col2:
             # Cost per feature
@@ -368,29 +441,14 @@ def show_cost_analysis(user_data: Dict, usage_stats: Dict):
             """, unsafe_allow_html=True)
             
             # Projected costs
-            subscription_tier = user_data.get('subscription_tier', 'free')
             if subscription_tier == 'free':
-                st.markdown("""
-                <div class="feature-card" style="border-left-color: #ffc107;">
-                    <strong>💡 Cost Optimization Tip:</strong><br>
-                    You're on the free plan. Consider upgrading to Pro for better value at higher usage levels.
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(_FREE_PLAN_TIP_HTML, unsafe_allow_html=True)
     else:
         st.info("No cost data available yet. Start using the platform to see your cost analysis!")
         
         # Show potential costs for different plans
         st.markdown("#### 💡 Plan Comparison")
-        
-        plans_data = {
-            'Plan': ['Free', 'Pro', 'Enterprise'],
-            'Monthly Cost': ['$0', '$29', '$99'],
-            'Tokens Included': ['10K', '100K', '1M'],
-            'Cost per Extra Token': ['N/A', '$0.001', '$0.0005']
-        }
-        
-        df_plans = pd.DataFrame(plans_data)
-        st.table(df_plans)
+        st.markdown(_PLANS_TABLE_HTML, unsafe_allow_html=True)
     
     # Cost optimization suggestions
     st.markdown("#### 💡 Cost Optimization Suggestions")
@@ -399,7 +457,7 @@ def show_cost_analysis(user_data: Dict, usage_stats: Dict):
     
     token_usage_pct = calculate_usage_percentage(
         usage_stats.get('total_tokens', 0),
-        get_subscription_limits(user_data.get('subscription_tier', 'free'))['monthly_tokens']
+        get_subscription_limits(subscription_tier)['monthly_tokens']
     )
     
     if token_usage_pct > 90:
@@ -412,13 +470,13 @@ def show_cost_analysis(user_data: Dict, usage_stats: Dict):
     if usage_stats.get('total_requests', 0) > 1000:
         suggestions.append("💡 Consider batching API requests to reduce costs.")
     
-    if user_data.get('subscription_tier') == 'free' and total_cost > 10:
+    if subscription_tier == 'free' and total_cost > 10:
         suggestions.append("💰 Upgrading to Pro could save money at your usage level.")
     
     for suggestion in suggestions:
         st.markdown(f"• {suggestion}")
 
-def show_activity_timeline(activity_logs: List[Dict]):
+def show_activity_timeline(activity_logs: List[Dict], logs_df: pd.DataFrame):
     """Show detailed activity timeline"""
     
     st.markdown("### 🔄 Activity Timeline")
@@ -427,29 +485,25 @@ def show_activity_timeline(activity_logs: List[Dict]):
         # Activity summary
         activity_summary = generate_activity_summary(activity_logs)
         
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            create_metric_card(
-                "Total Activities",
-                str(activity_summary['total_activities']),
-                "All time"
-            )
-        
-        with col2:
-            create_metric_card(
-                "Most Common",
-                activity_summary['most_common_activity'].replace('_', ' ').title(),
-                "Activity type"
-            )
-        
-        with col3:
-            recent_activity_time = time_ago(activity_logs[-1].get('created_at', '')) if activity_logs else 'Never'
-            create_metric_card(
-                "Last Activity",
-                recent_activity_time,
-                "Most recent"
-            )
+        recent_activity_time = time_ago(activity_logs[-1].get('created_at', '')) if activity_logs else 'Never'
+        
+        create_metric_grid([
+            {
+                'title': "Total Activities",
+                'value': str(activity_summary['total_activities']),
+                'subtitle': "All time"
+            },
+            {
+                'title': "Most Common",
+                'value': activity_summary['most_common_activity'].replace('_', ' ').title(),
+                'subtitle': "Activity type"
+            },
+            {
+                'title': "Last Activity",
+                'value': recent_activity_time,
+                'subtitle': "Most recent"
+            }
+        ])
         
         # Activity timeline
         st.markdown("#### 📋 Recent Activities")
@@ -460,7 +514,7 @@ def show_activity_timeline(activity_logs: List[Dict]):
         with col1:
             activity_filter = st.selectbox(
                 "Filter by Type",
-                options=['All'] + list(set([log.get('activity_type', 'Unknown') for log in activity_logs]))
+                options=['All'] + logs_df['activity_type'].unique().tolist()
             )
         
         with col2:
@@ -477,50 +531,57 @@ def show_activity_timeline(activity_logs: List[Dict]):
                 index=0
             )
         
-        # Filter and sort activities
-        filtered_logs = activity_logs
+        # Filter and sort activities, each paired with its pre-formatted timestamp
+        filtered_logs = list(zip(activity_logs, logs_df['_pretty_time'].tolist()))
         
         if activity_filter != 'All':
-            filtered_logs = [log for log in filtered_logs if log.get('activity_type') == activity_filter]
+            filtered_logs = [(log, t) for log, t in filtered_logs if log.get('activity_type') == activity_filter]
         
         if sort_order == 'Oldest First':
-            filtered_logs = filtered_logs[::-1]
+            filtered_logs = list(islice(reversed(filtered_logs), limit))
+        else:
+            filtered_logs = filtered_logs[:limit]
+        
+        # Color coding based on activity type
+        color_map = {
+            'login': '#4caf50',
+            'logout': '#ff9800',
+            'profile_update': '#2196f3',
+            'api_request': '#9c27b0',
+            'file_upload': '#00bcd4',
+            'chat_created': '#8bc34a',
+            'error': '#f44336'
+        }
         
-        filtered_logs = filtered_logs[:limit]
+        # Display names, computed once per distinct activity type
+        pretty_types = {
+            t: t.replace('_', ' ').title()
+            for t in {log.get('activity_type', 'Unknown') for log, _ in filtered_logs}
+        }
         
-        # Display activities
-        for i, activity in enumerate(filtered_logs):
-            activity_time = safe_date_format(activity.get('created_at', ''), '%B %d, %Y at %I:%M %p')
-            activity_type = activity.get('activity_type', 'Unknown').replace('_', ' ').title()
+        # Build every activity card first and send them in a single markdown call
+        activity_cards = []
+        for activity, activity_time in filtered_logs:
+            activity_type = pretty_types[activity.get('activity_type', 'Unknown')]
             description = activity.get('description', 'No description available')
-            
-            # Color coding based on activity type
-            color_map = {
-                'login': '#4caf50',
-                'logout': '#ff9800',
-                'profile_update': '#2196f3',
-                'api_request': '#9c27b0',
-                'file_upload': '#00bcd4',
-                'chat_created': '#8bc34a',
-                'error': '#f44336'
-            }
-            
             activity_color = color_map.get(activity.get('activity_type', ''), '#666')
+            metadata_html = f'<small style="color: #888;">Metadata: {activity.get("metadata", {})}</small>' if activity.get('metadata') else ''
             
-            st.markdown(f"""
+            activity_cards.append(f"""
             <div class="dashboard-card" style="margin: 10px 0; padding: 15px; border-left: 4px solid {activity_color};">
                 <div style="display: flex; justify-content: space-between; align-items: flex-start;">
                     <div style="flex: 1;">
                         <strong style="color: {activity_color};">{activity_type}</strong>
-                        <p style="margin: 5px 0 0 0; color: #666; font-size: 0.9rem;">{description}</p>
-                        {f'<small style="color: #888;">Metadata: {activity.get("metadata", {})}</small>' if activity.get('metadata') else ''}
+                        <p style="margin: 5px 0 0 0; color: #666; font-size: 0.9rem;">{description}</p>{metadata_html}
                     </div>
                     <div style="text-align: right; min-width: 150px;">
                         <small style="color: #888;">{activity_time}</small>
                     </div>
                 </div>
-            </div>
-            """, unsafe_allow_html=True)
+            </div>""")
+        
+        if activity_cards:
+            st.markdown("\n".join(activity_cards), unsafe_allow_html=True)
         
         if len(activity_logs) > limit:
             st.info(f"Showing {limit} of {len(activity_logs)} activities. Adjust the filter to see more.")
@@ -528,11 +589,18 @@ def show_activity_timeline(activity_logs: List[Dict]):
     else:
         st.info("No activity logs found. Start using the platform to see your activity timeline!")
 
-def show_detailed_reports(user_data: Dict, usage_stats: Dict, activity_logs: List[Dict]):
+def show_detailed_reports(usage_stats: Dict, logs_df: pd.DataFrame):
     """Show detailed reports and export options"""
     
     st.markdown("### 📋 Detailed Reports")
     
+    # Nothing to report or export for a brand-new account
+    if not _has_usage(usage_stats) and logs_df.empty:
+        st.info("No usage data yet. Reports and exports will be available once you start using the platform.")
+        st.markdown("#### 🔒 Privacy & Data Retention")
+        st.markdown(_RETENTION_HTML, unsafe_allow_html=True)
+        return
+    
     # Report generation options
     col1, col2 = st.columns(2)
     
@@ -575,7 +643,8 @@ def show_detailed_reports(user_data: Dict, usage_stats: Dict, activity_logs: Lis
         st.markdown("#### 📈 Quick Stats")
         
         # Calculate some quick statistics
-        total_days_active = len(set([log.get('created_at', '')[:10] for log in activity_logs if log.get('created_at')]))
+        created_at = logs_df['created_at'].dropna().astype(str)
+        total_days_active = int(created_at[created_at != ''].str.slice(0, 10).nunique())
         avg_daily_tokens = usage_stats.get('total_tokens', 0) / max(total_days_active, 1)
         avg_daily_cost = usage_stats.get('total_cost', 0) / max(total_days_active, 1)
         
@@ -610,19 +679,7 @@ def show_detailed_reports(user_data: Dict, usage_stats: Dict, activity_logs: Lis
     st.markdown("---")
     st.markdown("#### 🔒 Privacy & Data Retention")
     
-    st.markdown("""
-    <div class="feature-card">
-        <strong>Data Retention Policy:</strong><br>
-        • Activity logs: 1 year<br>
-        • Usage statistics: 2 years<br>
-        • Cost data: 7 years (for tax purposes)<br>
-        • Personal data: Until account deletion<br><br>
-        
-        <strong>Privacy:</strong><br>
-        Your data is encrypted and never shared with third parties. 
-        You can request data deletion at any time from your profile settings.
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_RETENTION_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
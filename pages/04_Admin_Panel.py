@@ -1,24 +1,23 @@
 import streamlit as st
-import sys
-import os
-
-# Add the parent directory to the path to import components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import re
 
 from components.auth import AuthManager
 from components.database import DatabaseManager
 from components.ui_components import (
-    load_custom_css, create_metric_card, show_alert, 
+    load_custom_css, create_metric_grid, show_alert, 
     create_dashboard_card, show_confirmation_dialog
 )
 from components.utils import (
     format_currency, time_ago, calculate_usage_percentage,
     get_subscription_limits, paginate_data
 )
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-from typing import Dict, List
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING, Dict, List
+
+# Plotly is imported inside the chart builders so the page loads without it
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # Page configuration
 st.set_page_config(
@@ -27,6 +26,265 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def _db() -> DatabaseManager:
+    """Shared service-role database manager instance"""
+    return DatabaseManager(use_service_role=True)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _all_users() -> List[Dict]:
+    """Get all users, cached across reruns and shared by every section"""
+    return _db().get_all_users()
+
+# User columns with their fill value and storage dtype; numeric columns are
+# coerced to contiguous NumPy dtypes so aggregations run as array reductions
+_USER_SCHEMA = {
+    'full_name': ('Unknown', object),
+    'email': ('No email', object),
+    'role': ('user', object),
+    'subscription_tier': ('free', object),
+    'is_active': (True, bool),
+    'pending_approval': (False, bool),
+    'activity_score': ('Never', object),
+    'tokens_used': (0, np.int64),
+    'total_cost': (0.0, np.float64),
+    'api_requests': (0, np.int64),
+    'chat_threads_count': (0, np.int64),
+    'file_uploads_count': (0, np.int64),
+    'custom_assistants_count': (0, np.int64)
+}
+
+# Activity buckets derived from the human-readable activity_score
+# (5 = today, 4 = yesterday, 3 = days ago, 2 = weeks ago, 1 = months ago, 0 = inactive)
+_ACTIVITY_RE = re.compile(r'Today|Yesterday|days ago|weeks ago|months ago')
+_ACTIVITY_BUCKETS = {'Today': 5, 'Yesterday': 4, 'days ago': 3, 'weeks ago': 2, 'months ago': 1}
+
+def _classify_activity(activity: str) -> int:
+    """Map an activity_score string to its activity bucket"""
+    match = _ACTIVITY_RE.search(activity)
+    return _ACTIVITY_BUCKETS[match.group(0)] if match else 0
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _users_df() -> pd.DataFrame:
+    """All users as one DataFrame for vectorized aggregation"""
+    df = pd.DataFrame(_all_users())
+    for column, (default, dtype) in _USER_SCHEMA.items():
+        if column not in df:
+            df[column] = default
+        if dtype is object:
+            df[column] = df[column].fillna(default)
+        elif dtype is bool:
+            df[column] = df[column].fillna(default).astype(bool)
+        else:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(default).astype(dtype)
+    df['activity_bucket'] = df['activity_score'].astype(str).map(_classify_activity).astype(int)
+    return df
+
+def _tier_counts(users_df: pd.DataFrame) -> Dict[str, int]:
+    """Users per subscription tier, taken from the frame already in hand"""
+    return {tier: int(n) for tier, n in users_df['subscription_tier'].value_counts().items()}
+
+def _clear_user_cache():
+    """Drop every cached view of the user snapshot"""
+    _all_users.clear()
+    _users_df.clear()
+
+# Notification type, health status and log level styling
+_TYPE_COLORS = {
+    "Info": "#2196f3",
+    "Warning": "#ff9800",
+    "Error": "#f44336",
+    "Maintenance": "#9c27b0",
+    "Feature Update": "#4caf50"
+}
+_HEALTH_COLORS = {"Healthy": "#4caf50", "Warning": "#ff9800", "Error": "#f44336"}
+_LOG_LEVEL_RE = re.compile(r'\[(ERROR|WARNING|INFO|DEBUG)\]')
+
+# Top users table columns and their display names
+_TOP_USER_COLUMNS = {
+    'full_name': 'Name',
+    'email': 'Email',
+    'subscription_tier': 'Plan',
+    'tokens_used': 'Tokens',
+    'total_cost': 'Cost',
+    'chat_threads_count': 'Threads'
+}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _last_n_dates(n: int) -> List[str]:
+    """ISO dates for the n days before today, oldest first"""
+    base = np.datetime64('today', 'D')
+    return (base - np.arange(n, 0, -1)).astype(str).tolist()
+
+def _plotly_express():
+    """Import plotly.express on first use, serializing figures with orjson when installed"""
+    import plotly.express as px
+    import plotly.io as pio
+    
+    try:
+        import orjson  # noqa: F401
+        pio.json.config.default_engine = "orjson"
+    except ImportError:  # Optional: figures are serialized with stdlib json without it
+        pass
+    return px
+
+# Chart builders, cached on their aggregated inputs so reruns reuse the figure
+@st.cache_data(show_spinner=False)
+def _build_growth_line(dates: tuple, totals: tuple) -> 'go.Figure':
+    """User growth line chart"""
+    px = _plotly_express()
+    fig = px.line(
+        x=list(dates),
+        y=list(totals),
+        title="User Growth (Last 30 Days)",
+        labels={'x': 'Date', 'y': 'Total Users'}
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333'),
+        showlegend=False
+    )
+    fig.update_traces(line_color='#4caf50', line_width=3)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _build_activity_bar(levels: tuple) -> 'go.Figure':
+    """User activity level bar chart"""
+    px = _plotly_express()
+    activity_levels = dict(levels)
+    fig = px.bar(
+        x=list(activity_levels.keys()),
+        y=list(activity_levels.values()),
+        title="User Activity Levels",
+        color=list(activity_levels.values()),
+        color_continuous_scale='Greens'
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333'),
+        showlegend=False
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _build_subs_pie(counts: tuple) -> 'go.Figure':
+    """Subscription tier pie chart"""
+    px = _plotly_express()
+    subscription_counts = dict(counts)
+    fig = px.pie(
+        values=list(subscription_counts.values()),
+        names=list(subscription_counts.keys()),
+        title="Subscription Tiers"
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333')
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _build_usage_bar(metrics: tuple, counts: tuple) -> 'go.Figure':
+    """Platform usage bar chart"""
+    px = _plotly_express()
+    fig = px.bar(
+        x=list(metrics),
+        y=list(counts),
+        title="Platform Usage Metrics",
+        color=list(counts),
+        color_continuous_scale='Greens'
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333'),
+        showlegend=False,
+        xaxis_tickangle=-45
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _build_registrations_bar(dates: tuple, counts: tuple) -> 'go.Figure':
+    """Daily registrations bar chart"""
+    px = _plotly_express()
+    fig = px.bar(
+        x=list(dates),
+        y=list(counts),
+        title="Daily Registrations (Last 7 Days)",
+        labels={'x': 'Date', 'y': 'New Users'}
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333'),
+        showlegend=False
+    )
+    fig.update_traces(marker_color='#4caf50')
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _build_revenue_line(dates: tuple, revenue: tuple) -> 'go.Figure':
+    """Daily revenue line chart"""
+    px = _plotly_express()
+    fig = px.line(
+        x=list(dates),
+        y=list(revenue),
+        title="Daily Revenue (Last 30 Days)",
+        labels={'x': 'Date', 'y': 'Revenue ($)'}
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333'),
+        showlegend=False
+    )
+    fig.update_traces(line_color='#4caf50', line_width=3)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _build_funnel() -> 'go.Figure':
+    """Conversion funnel chart (static sample data)"""
+    px = _plotly_express()
+    # Sample conversion data
+    funnel_data = {
+        'Stage': ['Visitors', 'Signups', 'Email Verified', 'First Use', 'Paid Users'],
+        'Count': [1000, 250, 200, 150, 50],
+        'Conversion': [100, 25, 20, 15, 5]
+    }
+    
+    fig = px.funnel(
+        y=funnel_data['Stage'],
+        x=funnel_data['Count'],
+        title="User Conversion Funnel"
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333')
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _build_features_bar(features: tuple, users: tuple) -> 'go.Figure':
+    """Feature adoption bar chart"""
+    px = _plotly_express()
+    fig = px.bar(
+        x=list(features),
+        y=list(users),
+        title="Feature Adoption",
+        color=list(users),
+        color_continuous_scale='Greens'
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333'),
+        showlegend=False
+    )
+    return fig
+
 def main():
     """Main admin panel page"""
     
@@ -43,7 +301,7 @@ def main():
     user_data = st.session_state.get('user_data', {})
     
     # Initialize database manager with service role
-    db = DatabaseManager(use_service_role=True)
+    db = _db()
     
     # Page header
     st.markdown(f"""
@@ -53,33 +311,43 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    # Refresh button busts the cached user snapshot
+    col_refresh1, col_refresh2 = st.columns([5, 1])
+    with col_refresh2:
+        if st.button("🔄 Refresh Data", use_container_width=True):
+            _clear_user_cache()
+    
     # Admin dashboard sections
     show_system_overview(db)
     
     st.markdown("---")
     
-    # Admin tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "📊 System Stats", 
-        "⚙️ System Settings", 
-        "🔔 Notifications", 
-        "📈 Analytics", 
-        "🛠️ Maintenance"
-    ])
-    
-    with tab1:
+    # Admin sections (st.tabs would execute every tab body on each rerun,
+    # so only the selected section is rendered; the widget-heavy sections are
+    # fragments, so their own widgets rerun just that section)
+    admin_section = st.radio(
+        "Admin section",
+        options=[
+            "📊 System Stats", 
+            "⚙️ System Settings", 
+            "🔔 Notifications", 
+            "📈 Analytics", 
+            "🛠️ Maintenance"
+        ],
+        horizontal=True,
+        key="admin_section",
+        label_visibility="collapsed"
+    )
+    
+    if admin_section == "📊 System Stats":
         show_system_statistics(db)
-    
-    with tab2:
+    elif admin_section == "⚙️ System Settings":
         show_system_settings()
-    
-    with tab3:
+    elif admin_section == "🔔 Notifications":
         show_notifications_management(db)
-    
-    with tab4:
+    elif admin_section == "📈 Analytics":
         show_admin_analytics(db)
-    
-    with tab5:
+    else:
         show_maintenance_tools(db)
 
 def show_system_overview(db: DatabaseManager):
@@ -89,108 +357,94 @@ def show_system_overview(db: DatabaseManager):
     
     try:
         # Get all users for statistics
-        all_users = db.get_all_users()
+        users_df = _users_df()
         
         # Calculate system metrics
-        total_users = len(all_users)
-        active_users = len([u for u in all_users if u.get('is_active', True)])
-        admin_users = len([u for u in all_users if u.get('role') == 'admin'])
-        pending_users = len([u for u in all_users if u.get('pending_approval', False)])
+        total_users = len(users_df)
+        active_users = int(users_df['is_active'].sum())
+        admin_users = int((users_df['role'] == 'admin').sum())
+        pending_users = int(users_df['pending_approval'].sum())
         
         # Subscription metrics
-        free_users = len([u for u in all_users if u.get('subscription_tier') == 'free'])
-        pro_users = len([u for u in all_users if u.get('subscription_tier') == 'pro'])
-        enterprise_users = len([u for u in all_users if u.get('subscription_tier') == 'enterprise'])
+        tier_counts = _tier_counts(users_df)
+        free_users = tier_counts.get('free', 0)
+        pro_users = tier_counts.get('pro', 0)
+        enterprise_users = tier_counts.get('enterprise', 0)
         
         # Usage metrics
-        total_tokens = sum([u.get('tokens_used', 0) for u in all_users])
-        total_cost = sum([u.get('total_cost', 0) for u in all_users])
-        total_threads = sum([u.get('chat_threads_count', 0) for u in all_users])
-        total_files = sum([u.get('file_uploads_count', 0) for u in all_users])
+        total_tokens = int(users_df['tokens_used'].sum())
+        total_cost = float(users_df['total_cost'].sum())
+        total_threads = int(users_df['chat_threads_count'].sum())
+        total_files = int(users_df['file_uploads_count'].sum())
         
         # Activity metrics
-        active_today = len([u for u in all_users if 'Today' in str(u.get('activity_score', ''))])
-        active_week = len([u for u in all_users if any(x in str(u.get('activity_score', '')) for x in ['Today', 'Yesterday', 'days ago'])])
+        bucket = users_df['activity_bucket']
+        active_today = int((bucket == 5).sum())
+        active_week = int((bucket >= 3).sum())
         
         # Main metrics row
-        col1, col2, col3, col4, col5, col6 = st.columns(6)
-        
-        with col1:
-            create_metric_card(
-                "Total Users",
-                str(total_users),
-                f"{active_users} active",
-                "#4caf50"
-            )
-        
-        with col2:
-            create_metric_card(
-                "Pending Approvals",
-                str(pending_users),
-                "Awaiting review",
-                "#ff9800" if pending_users > 0 else "#4caf50"
-            )
-        
-        with col3:
-            create_metric_card(
-                "Active Today",
-                str(active_today),
-                f"{active_week} this week",
-                "#4caf50"
-            )
-        
-        with col4:
-            create_metric_card(
-                "Total Revenue",
-                format_currency(total_cost),
-                "All time",
-                "#2e7d32"
-            )
-        
-        with col5:
-            create_metric_card(
-                "Token Usage",
-                f"{total_tokens:,}",
-                "All users",
-                "#4caf50"
-            )
-        
-        with col6:
-            create_metric_card(
-                "System Health",
-                "Healthy",
-                "All systems operational",
-                "#4caf50"
-            )
+        create_metric_grid([
+            {
+                'title': "Total Users",
+                'value': str(total_users),
+                'subtitle': f"{active_users} active",
+                'color': "#4caf50"
+            },
+            {
+                'title': "Pending Approvals",
+                'value': str(pending_users),
+                'subtitle': "Awaiting review",
+                'color': "#ff9800" if pending_users > 0 else "#4caf50"
+            },
+            {
+                'title': "Active Today",
+                'value': str(active_today),
+                'subtitle': f"{active_week} this week",
+                'color': "#4caf50"
+            },
+            {
+                'title': "Total Revenue",
+                'value': format_currency(total_cost),
+                'subtitle': "All time",
+                'color': "#2e7d32"
+            },
+            {
+                'title': "Token Usage",
+                'value': f"{total_tokens:,}",
+                'subtitle': "All users",
+                'color': "#4caf50"
+            },
+            {
+                'title': "System Health",
+                'value': "Healthy",
+                'subtitle': "All systems operational",
+                'color': "#4caf50"
+            }
+        ])
         
         # Subscription breakdown
         st.markdown("#### 💳 Subscription Breakdown")
         
-        col7, col8, col9 = st.columns(3)
-        
-        with col7:
-            create_metric_card(
-                "Free Users",
-                str(free_users),
-                f"{(free_users/max(total_users,1)*100):.1f}% of total",
-                "#4caf50"
-            )
-        
-        with col8:
-            create_metric_card(
-                "Pro Users",
-                str(pro_users),
-                f"{(pro_users/max(total_users,1)*100):.1f}% of total",
-                "#ff9800"
-            )
-        
-        with col9:
-            create_metric_card(
-                "Enterprise Users",
-                str(enterprise_users),
-                f"{(enterprise_users/max(total_users,1)*100):.1f}% of total",
-                "#9c27b0"
-            )
+        create_metric_grid([
+            {
+                'title': "Free Users",
+                'value': str(free_users),
+                'subtitle': f"{(free_users/max(total_users,1)*100):.1f}% of total",
+                'color': "#4caf50"
+            },
+            {
+                'title': "Pro Users",
+                'value': str(pro_users),
+                'subtitle': f"{(pro_users/max(total_users,1)*100):.1f}% of total",
+                'color': "#ff9800"
+            },
+            {
+                'title': "Enterprise Users",
+                'value': str(enterprise_users),
+                'subtitle': f"{(enterprise_users/max(total_users,1)*100):.1f}% of total",
+                'color': "#9c27b0"
+            }
+        ])
         
     except Exception as e:
         st.error(f"Error loading system overview: {str(e)}")
@@ -201,9 +455,9 @@ def show_system_statistics(db: DatabaseManager):
     st.markdown("### 📊 Detailed System Statistics")
     
     try:
-        all_users = db.get_all_users()
+        users_df = _users_df()
         
-        if not all_users:
+        if users_df.empty:
             st.warning("No user data available")
             return
         
@@ -214,130 +468,70 @@ def show_system_statistics(db: DatabaseManager):
             st.markdown("#### 📈 User Growth")
             
             # Generate sample growth data
-            dates = [(datetime.now() - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(30, 0, -1)]
-            cumulative_users = [max(1, len(all_users) - (30-i)*2) for i in range(30)]
+            dates = _last_n_dates(30)
+            cumulative_users = np.maximum(1, len(users_df) - (30 - np.arange(30)) * 2).tolist()
             
-            fig_growth = px.line(
-                x=dates,
-                y=cumulative_users,
-                title="User Growth (Last 30 Days)",
-                labels={'x': 'Date', 'y': 'Total Users'}
-            )
-            fig_growth.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333'),
-                showlegend=False
-            )
-            fig_growth.update_traces(line_color='#4caf50', line_width=3)
+            fig_growth = _build_growth_line(tuple(dates), tuple(cumulative_users))
             st.plotly_chart(fig_growth, use_container_width=True)
             
             # Activity distribution
             st.markdown("#### 🔄 User Activity Distribution")
             
-            activity_levels = {'High': 0, 'Medium': 0, 'Low': 0, 'Inactive': 0}
+            bucket = users_df['activity_bucket']
             
-            for user in all_users:
-                activity = user.get('activity_score', 'Never')
-                if activity in ['Today', 'Yesterday']:
-                    activity_levels['High'] += 1
-                elif 'days ago' in activity or 'weeks ago' in activity:
-                    activity_levels['Medium'] += 1
-                elif 'months ago' in activity:
-                    activity_levels['Low'] += 1
-                else:
-                    activity_levels['Inactive'] += 1
+            activity_levels = {
+                'High': int((bucket >= 4).sum()),
+                'Medium': int(bucket.between(2, 3).sum()),
+                'Low': int((bucket == 1).sum()),
+                'Inactive': int((bucket == 0).sum())
+            }
             
-            fig_activity = px.bar(
-                x=list(activity_levels.keys()),
-                y=list(activity_levels.values()),
-                title="User Activity Levels",
-                color=list(activity_levels.values()),
-                color_continuous_scale='Greens'
-            )
-            fig_activity.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333'),
-                showlegend=False
-            )
+            fig_activity = _build_activity_bar(tuple(activity_levels.items()))
             st.plotly_chart(fig_activity, use_container_width=True)
         
         with col2:
             # Subscription distribution
             st.markdown("#### 💳 Subscription Distribution")
             
-            subscription_counts = {}
-            for user in all_users:
-                tier = user.get('subscription_tier', 'free')
-                subscription_counts[tier] = subscription_counts.get(tier, 0) + 1
+            subscription_counts = _tier_counts(users_df)
             
-            fig_subs = px.pie(
-                values=list(subscription_counts.values()),
-                names=list(subscription_counts.keys()),
-                title="Subscription Tiers"
-            )
-            fig_subs.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333')
-            )
+            fig_subs = _build_subs_pie(tuple(subscription_counts.items()))
             st.plotly_chart(fig_subs, use_container_width=True)
             
             # Usage statistics
             st.markdown("#### 📊 Usage Statistics")
             
+            usage_keys = ['tokens_used', 'api_requests', 'chat_threads_count', 'file_uploads_count', 'custom_assistants_count']
+            
             usage_data = {
                 'Metric': ['Total Tokens', 'API Requests', 'Chat Threads', 'File Uploads', 'Custom Assistants'],
-                'Count': [
-                    sum([u.get('tokens_used', 0) for u in all_users]),
-                    sum([u.get('api_requests', 0) for u in all_users]),
-                    sum([u.get('chat_threads_count', 0) for u in all_users]),
-                    sum([u.get('file_uploads_count', 0) for u in all_users]),
-                    sum([u.get('custom_assistants_count', 0) for u in all_users])
-                ]
+                'Count': users_df[usage_keys].sum().tolist()
             }
             
-            fig_usage = px.bar(
-                x=usage_data['Metric'],
-                y=usage_data['Count'],
-                title="Platform Usage Metrics",
-                color=usage_data['Count'],
-                color_continuous_scale='Greens'
-            )
-            fig_usage.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333'),
-                showlegend=False,
-                xaxis_tickangle=-45
-            )
+            fig_usage = _build_usage_bar(tuple(usage_data['Metric']), tuple(usage_data['Count']))
             st.plotly_chart(fig_usage, use_container_width=True)
         
         # Top users table
         st.markdown("#### 🏆 Top Users by Activity")
         
-        # Sort users by tokens used
-        top_users = sorted(all_users, key=lambda x: x.get('tokens_used', 0), reverse=True)[:10]
-        
-        if top_users:
-            for i, user in enumerate(top_users, 1):
-                col_rank, col_info, col_stats = st.columns([1, 3, 2])
-                
-                with col_rank:
-                    st.markdown(f"**#{i}**")
-                
-                with col_info:
-                    st.markdown(f"**{user.get('full_name', 'Unknown')}**")
-                    st.caption(f"{user.get('email', 'No email')} • {user.get('subscription_tier', 'free').title()}")
-                
-                with col_stats:
-                    st.markdown(f"🔢 {user.get('tokens_used', 0):,} tokens")
-                    st.caption(f"💰 {format_currency(user.get('total_cost', 0))} • 🧵 {user.get('chat_threads_count', 0)} threads")
+        # Top 10 users by tokens used (partial selection on the typed column, no full sort)
+        top_df = users_df.nlargest(10, 'tokens_used')[list(_TOP_USER_COLUMNS)].copy()
+        
+        if not top_df.empty:
+            # One dataframe instead of a row of columns and markdown widgets per user
+            top_df['subscription_tier'] = top_df['subscription_tier'].str.title()
+            top_df.index = pd.RangeIndex(1, len(top_df) + 1, name='#')
+            top_df = top_df.rename(columns=_TOP_USER_COLUMNS)
+            
+            st.dataframe(
+                top_df.style.format({'Tokens': '{:,.0f}', 'Cost': format_currency}),
+                use_container_width=True
+            )
         
     except Exception as e:
         st.error(f"Error loading statistics: {str(e)}")
 
+@st.fragment
 def show_system_settings():
     """Show system settings management"""
     
@@ -455,6 +649,7 @@ def show_system_settings():
             st.success("✅ System settings saved successfully!")
             st.info("Some settings may require a system restart to take effect.")
 
+@st.fragment
 def show_notifications_management(db: DatabaseManager):
     """Show notifications management"""
     
@@ -545,19 +740,13 @@ def show_notifications_management(db: DatabaseManager):
         }
     ]
     
+    # Build every notification card first and send them in a single markdown call
+    notification_cards = []
     for notification in recent_notifications:
-        type_colors = {
-            "Info": "#2196f3",
-            "Warning": "#ff9800",
-            "Error": "#f44336",
-            "Maintenance": "#9c27b0",
-            "Feature Update": "#4caf50"
-        }
-        
-        color = type_colors.get(notification["type"], "#666")
+        color = _TYPE_COLORS.get(notification["type"], "#666")
         sent_time = time_ago(notification["sent_at"])
         
-        st.markdown(f"""
+        notification_cards.append(f"""
         <div class="dashboard-card" style="border-left: 4px solid {color};">
             <div style="display: flex; justify-content: space-between; align-items: flex-start;">
                 <div style="flex: 1;">
@@ -571,16 +760,18 @@ def show_notifications_management(db: DatabaseManager):
                     <small style="color: #888;">{sent_time}</small>
                 </div>
             </div>
-        </div>
-        """, unsafe_allow_html=True)
+        </div>""")
+    
+    st.markdown("\n".join(notification_cards), unsafe_allow_html=True)
 
+@st.fragment
 def show_admin_analytics(db: DatabaseManager):
     """Show admin-specific analytics"""
     
     st.markdown("### 📈 Admin Analytics")
     
     try:
-        all_users = db.get_all_users()
+        users_df = _users_df()
         
         # Time-based analytics
         col1, col2 = st.columns(2)
@@ -589,65 +780,26 @@ def show_admin_analytics(db: DatabaseManager):
             st.markdown("#### 📅 Registration Trends")
             
             # Generate sample registration data
-            dates = [(datetime.now() - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(30, 0, -1)]
-            daily_registrations = [max(0, (i % 7) + (i % 3)) for i in range(30)]
+            dates = _last_n_dates(30)
+            days = np.arange(30)
+            daily_registrations = ((days % 7) + (days % 3)).clip(min=0).tolist()
             
-            fig_registrations = px.bar(
-                x=dates[-7:],  # Last 7 days
-                y=daily_registrations[-7:],
-                title="Daily Registrations (Last 7 Days)",
-                labels={'x': 'Date', 'y': 'New Users'}
-            )
-            fig_registrations.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333'),
-                showlegend=False
-            )
-            fig_registrations.update_traces(marker_color='#4caf50')
+            fig_registrations = _build_registrations_bar(tuple(dates[-7:]), tuple(daily_registrations[-7:]))  # Last 7 days
             st.plotly_chart(fig_registrations, use_container_width=True)
             
             # Revenue trends
             st.markdown("#### 💰 Revenue Trends")
             
-            total_revenue = sum([u.get('total_cost', 0) for u in all_users])
-            daily_revenue = [total_revenue / 30 * (1 + (i % 5) * 0.2) for i in range(30)]
+            total_revenue = float(users_df['total_cost'].sum())
+            daily_revenue = (total_revenue / 30 * (1 + (np.arange(30) % 5) * 0.2)).tolist()
             
-            fig_revenue = px.line(
-                x=dates,
-                y=daily_revenue,
-                title="Daily Revenue (Last 30 Days)",
-                labels={'x': 'Date', 'y': 'Revenue ($)'}
-            )
-            fig_revenue.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333'),
-                showlegend=False
-            )
-            fig_revenue.update_traces(line_color='#4caf50', line_width=3)
+            fig_revenue = _build_revenue_line(tuple(dates), tuple(daily_revenue))
             st.plotly_chart(fig_revenue, use_container_width=True)
         
         with col2:
             st.markdown("#### 🎯 Conversion Funnel")
             
-            # Sample conversion data
-            funnel_data = {
-                'Stage': ['Visitors', 'Signups', 'Email Verified', 'First Use', 'Paid Users'],
-                'Count': [1000, 250, 200, 150, 50],
-                'Conversion': [100, 25, 20, 15, 5]
-            }
-            
-            fig_funnel = px.funnel(
-                y=funnel_data['Stage'],
-                x=funnel_data['Count'],
-                title="User Conversion Funnel"
-            )
-            fig_funnel.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333')
-            )
+            fig_funnel = _build_funnel()
             st.plotly_chart(fig_funnel, use_container_width=True)
             
             # Feature usage
@@ -655,64 +807,46 @@ def show_admin_analytics(db: DatabaseManager):
             
             feature_usage = {
                 'Feature': ['Chat', 'File Upload', 'Custom Assistants', 'API', 'Voice'],
-                'Users': [len(all_users) * 0.8, len(all_users) * 0.6, len(all_users) * 0.3, len(all_users) * 0.4, len(all_users) * 0.2]
+                'Users': [len(users_df) * 0.8, len(users_df) * 0.6, len(users_df) * 0.3, len(users_df) * 0.4, len(users_df) * 0.2]
             }
             
-            fig_features = px.bar(
-                x=feature_usage['Feature'],
-                y=feature_usage['Users'],
-                title="Feature Adoption",
-                color=feature_usage['Users'],
-                color_continuous_scale='Greens'
-            )
-            fig_features.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333'),
-                showlegend=False
-            )
+            fig_features = _build_features_bar(tuple(feature_usage['Feature']), tuple(feature_usage['Users']))
             st.plotly_chart(fig_features, use_container_width=True)
         
         # Performance metrics
         st.markdown("#### ⚡ Performance Metrics")
         
-        col3, col4, col5, col6 = st.columns(4)
-        
-        with col3:
-            create_metric_card(
-                "Avg Response Time",
-                "245ms",
-                "API endpoints",
-                "#4caf50"
-            )
-        
-        with col4:
-            create_metric_card(
-                "Uptime",
-                "99.9%",
-                "Last 30 days",
-                "#4caf50"
-            )
-        
-        with col5:
-            create_metric_card(
-                "Error Rate",
-                "0.1%",
-                "Last 24 hours",
-                "#4caf50"
-            )
-        
-        with col6:
-            create_metric_card(
-                "Support Tickets",
-                "12",
-                "Open tickets",
-                "#ff9800"
-            )
+        create_metric_grid([
+            {
+                'title': "Avg Response Time",
+                'value': "245ms",
+                'subtitle': "API endpoints",
+                'color': "#4caf50"
+            },
+            {
+                'title': "Uptime",
+                'value': "99.9%",
+                'subtitle': "Last 30 days",
+                'color': "#4caf50"
+            },
+            {
+                'title': "Error Rate",
+                'value': "0.1%",
+                'subtitle': "Last 24 hours",
+                'color': "#4caf50"
+            },
+            {
+                'title': "Support Tickets",
+                'value': "12",
+                'subtitle': "Open tickets",
+                'color': "#ff9800"
+            }
+        ])
         
     except Exception as e:
         st.error(f"Error loading analytics: {str(e)}")
 
+@st.fragment
 def show_maintenance_tools(db: DatabaseManager):
     """Show system maintenance tools"""
     
@@ -728,7 +862,9 @@ def show_maintenance_tools(db: DatabaseManager):
         
         if st.button("🔄 Refresh User Cache", use_container_width=True):
             st.cache_resource.clear()
-            st.success("✅ User cache refreshed")
+            _clear_user_cache()
+            # A fragment rerun alone would leave the rest of the page on the old snapshot
+            st.rerun(scope="app")
         
         if st.button("📊 Rebuild Statistics", use_container_width=True):
             st.info("🔄 Rebuilding database statistics...")
@@ -749,20 +885,19 @@ def show_maintenance_tools(db: DatabaseManager):
         
         # System health checks
         health_checks = [
-            {"name": "Database Connection", "status": "Healthy", "color": "#4caf50"},
-            {"name": "API Endpoints", "status": "Healthy", "color": "#4caf50"},
-            {"name": "File Storage", "status": "Healthy", "color": "#4caf50"},
-            {"name": "Email Service", "status": "Warning", "color": "#ff9800"},
-            {"name": "Background Jobs", "status": "Healthy", "color": "#4caf50"}
+            {"name": "Database Connection", "status": "Healthy"},
+            {"name": "API Endpoints", "status": "Healthy"},
+            {"name": "File Storage", "status": "Healthy"},
+            {"name": "Email Service", "status": "Warning"},
+            {"name": "Background Jobs", "status": "Healthy"}
         ]
         
-        for check in health_checks:
-            st.markdown(f"""
-            <div class="feature-card" style="border-left-color: {check['color']};">
+        health_cards = [f"""
+            <div class="feature-card" style="border-left-color: {_HEALTH_COLORS[check['status']]};">
                 <strong>{check['name']}:</strong> 
-                <span style="color: {check['color']};">{check['status']}</span>
-            </div>
-            """, unsafe_allow_html=True)
+                <span style="color: {_HEALTH_COLORS[check['status']]};">{check['status']}</span>
+            </div>""" for check in health_checks]
+        st.markdown("\n".join(health_cards), unsafe_allow_html=True)
         
         if st.button("🔍 Run Full Health Check", use_container_width=True):
             st.info("🔄 Running comprehensive health check...")
@@ -829,13 +964,19 @@ def show_maintenance_tools(db: DatabaseManager):
                 "2024-01-15 10:26:00 [DEBUG] Cache refresh initiated"
             ]
             
+            # Bucket lines by level in one pass and render one block per level
+            buckets = {'ERROR': [], 'WARNING': [], 'INFO': []}
             for log in sample_logs:
-                if "ERROR" in log:
-                    st.error(log)
-                elif "WARNING" in log:
-                    st.warning(log)
-                else:
-                    st.info(log)
+                match = _LOG_LEVEL_RE.search(log)
+                level = match.group(1) if match else 'INFO'
+                buckets.get(level, buckets['INFO']).append(log)
+            
+            if buckets['ERROR']:
+                st.error("\n\n".join(buckets['ERROR']))
+            if buckets['WARNING']:
+                st.warning("\n\n".join(buckets['WARNING']))
+            if buckets['INFO']:
+                st.info("\n\n".join(buckets['INFO']))
     
     # Emergency tools
     st.markdown("---")
@@ -1,26 +1,24 @@
 import streamlit as st
-import sys
-import os
-
-# Add the parent directory to the path to import components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from components.auth import AuthManager
 from components.database import DatabaseManager
 from components.ui_components import (
     load_custom_css, create_metric_card, show_alert,
     create_user_card, show_confirmation_dialog, safe_date_format,
-    calculate_activity_score, get_activity_class
+    get_activity_class
 )
 from components.utils import (
-    format_currency, time_ago, filter_users, paginate_data,
-    get_role_color, get_status_color, export_data_to_csv
+    format_currency, time_ago, filter_users, calculate_activity_scores,
+    get_role_color, get_status_color
 )
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Tuple
+import numpy as np
 import pandas as pd
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 # Page configuration
 st.set_page_config(
@@ -29,6 +27,26 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def _db() -> DatabaseManager:
+    """Shared service-role database manager instance"""
+    return DatabaseManager(use_service_role=True)
+
+@st.cache_data(ttl=30, show_spinner="Loading user data...")
+def _load_all_users() -> List[Dict]:
+    """Get all users, cached so tab and widget reruns skip the round-trip"""
+    return _db().get_all_users()
+
+def _clear_user_cache():
+    """Drop every cached view of the user snapshot after a change"""
+    _load_all_users.clear()
+    _users_frame.clear()
+    _compute_overview_stats.clear()
+    _users_csv.clear()
+    _users_to_soa.clear()
+    _compute_bulk_masks.clear()
+    _build_heatmap_fig.clear()
+
 def main():
     """Main user management page"""
     
@@ -41,8 +59,8 @@ def main():
     # Require admin authentication
     auth_manager.require_role('admin')
     
-    # Initialize database manager with service role
-    db = DatabaseManager(use_service_role=True)
+    # Shared database manager with service role
+    db = _db()
     
     # Page header
     st.markdown(f"""
@@ -52,14 +70,32 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Get all users
-    with st.spinner("Loading user data..."):
-        all_users = db.get_all_users()
+    # Get all users (cached across reruns)
+    all_users = _load_all_users()
     
     if not all_users:
         st.error("❌ No user data available or failed to load users")
         return
     
+    # One typed DataFrame drives every aggregate view
+    fingerprint = _users_fingerprint(all_users)
+    users_df = _users_frame(fingerprint, all_users)
+    
+    # Share the parsed timestamps and activity labels with the per-user views,
+    # joined on id since the cached frame may not share the list's order
+    derived = users_df.drop_duplicates('id').set_index('id')[
+        ['_created_at_dt', '_last_sign_in_dt', '_activity_score', '_security_score']
+    ].to_dict('index')
+    for user in all_users:
+        row = derived.get(user.get('id'))
+        if row is None:
+            row = {'_created_at_dt': pd.NaT, '_last_sign_in_dt': pd.NaT,
+                   '_activity_score': 'Unknown', '_security_score': 0}
+        user['_created_at_dt'] = row['_created_at_dt']
+        user['_last_sign_in_dt'] = row['_last_sign_in_dt']
+        user['_activity_score'] = row['_activity_score']
+        user['_security_score'] = int(row['_security_score'])
+    
     # User management tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📊 Overview", 
@@ -70,46 +106,158 @@ def main():
     ])
     
     with tab1:
-        show_users_overview(all_users)
+        show_users_overview(users_df, fingerprint)
     
     with tab2:
-        show_all_users(all_users, db)
+        show_all_users(all_users, users_df, fingerprint, db)
     
     with tab3:
         show_pending_approvals(all_users, db)
     
     with tab4:
-        show_user_analytics(all_users)
+        show_user_analytics(users_df, fingerprint)
     
     with tab5:
-        show_bulk_operations(all_users, db)
+        show_bulk_operations(users_df, fingerprint, db)
+
+def _format_ts(ts: pd.Timestamp, format_str: str) -> str:
+    """Format a pre-parsed timestamp, mirroring safe_date_format for missing values"""
+    return "Not set" if pd.isna(ts) else ts.strftime(format_str)
+
+def _users_fingerprint(users: List[Dict]) -> str:
+    """Cheap cache key for a user list: each id with the fields the cached views read"""
+    # Usage totals come from other tables and don't bump updated_at, so they
+    # are keyed directly; timestamps may be datetimes or None, hence strings
+    fields = ('updated_at', 'last_sign_in_at', 'role', 'subscription_tier', 'tokens_used', 'total_cost')
+    entries = sorted(
+        "|".join([str(u.get('id', ''))] + [str(u.get(field) or '') for field in fields])
+        for u in users
+    )
+    return hashlib.md5("\n".join(entries).encode()).hexdigest()
+
+# User columns with their fill value and storage dtype; numeric columns are
+# coerced to NumPy dtypes so the overview and analytics run as array reductions
+_USER_SCHEMA = {
+    'full_name': ('User', object),
+    'role': ('user', object),
+    'subscription_tier': ('free', object),
+    'is_active': (True, bool),
+    'pending_approval': (False, bool),
+    'two_factor_enabled': (False, bool),
+    'created_at': ('', object),
+    'email_confirmed_at': ('', object),
+    'last_sign_in_at': ('', object),
+    'tokens_used': (0, np.int64),
+    'total_cost': (0.0, np.float64),
+    'api_requests': (0, np.int64),
+    'chat_threads_count': (0, np.int64),
+    'file_uploads_count': (0, np.int64)
+}
 
-def show_users_overview(users: List[Dict]):
+@st.cache_data(ttl=60, show_spinner=False)
+def _users_frame(fingerprint: str, _users: List[Dict]) -> pd.DataFrame:
+    """All users as one typed DataFrame, rebuilt once per dataset"""
+    df = pd.DataFrame(_users)
+    for column, (default, dtype) in _USER_SCHEMA.items():
+        if column not in df:
+            df[column] = default
+        if dtype is object:
+            df[column] = df[column].fillna(default)
+        elif dtype is bool:
+            df[column] = df[column].fillna(default).astype(bool)
+        else:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(default).astype(dtype)
+    
+    # Parse timestamps once; whole days since last sign-in (NaN when never signed in)
+    df['_created_at_dt'] = pd.to_datetime(df['created_at'], errors='coerce', utc=True, format='ISO8601')
+    df['_last_sign_in_dt'] = pd.to_datetime(df['last_sign_in_at'], errors='coerce', utc=True, format='ISO8601')
+    now = pd.Timestamp.now(tz='UTC')
+    df['_age_days'] = (now - df['_last_sign_in_dt']).dt.days
+    df['_activity_score'] = calculate_activity_scores(df['last_sign_in_at'], now=now)
+    
+    # Security score: 25 points per check passed
+    strong_password = (
+        df['password'].fillna('').astype(str).str.len().ge(8) if 'password' in df
+        else pd.Series(False, index=df.index)
+    )
+    df['_security_score'] = 25 * (
+        df['email_confirmed_at'].astype(bool).astype(int)
+        + df['two_factor_enabled'].astype(int)
+        + df['last_sign_in_at'].astype(bool).astype(int)
+        + strong_password.astype(int)
+    )
+    return df
+
+# Subscription tiers in display order
+_TIERS = ['free', 'pro', 'enterprise']
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _compute_overview_stats(fingerprint: str, _users_df: pd.DataFrame) -> Dict:
+    """Overview counters and totals, computed once per dataset"""
+    df = _users_df
+    role_counts = df['role'].value_counts().sort_index()
+    tier_counts = df['subscription_tier'].value_counts().reindex(_TIERS, fill_value=0)
+    active_today = df['_age_days'].eq(0)
+    active_week = df['_age_days'].le(7)
+    totals = df[['total_cost', 'tokens_used', 'api_requests']].sum()
+    
+    return {
+        'total_users': len(df),
+        'admin_users': int(role_counts.get('admin', 0)),
+        'moderator_users': int(role_counts.get('moderator', 0)),
+        'active_users': int(df['is_active'].sum()),
+        'verified_users': int(df['email_confirmed_at'].astype(bool).sum()),
+        'pending_approvals': int(df['pending_approval'].sum()),
+        'free_users': int(tier_counts['free']),
+        'pro_users': int(tier_counts['pro']),
+        'enterprise_users': int(tier_counts['enterprise']),
+        'active_today': int(active_today.sum()),
+        'active_week': int(active_week.sum()),
+        'total_revenue': float(totals['total_cost']),
+        'total_tokens': int(totals['tokens_used']),
+        'total_api_requests': int(totals['api_requests']),
+        'role_counts': tuple((role, int(n)) for role, n in role_counts.items()),
+        'tier_counts': tuple((tier, int(n)) for tier, n in tier_counts.items())
+    }
+
+def _role_pie_spec(counts: tuple) -> Dict:
+    """Vega-Lite spec for the user role distribution pie chart"""
+    return {
+        'title': "User Role Distribution",
+        'data': {'values': [{'role': role, 'count': n} for role, n in counts]},
+        'mark': {'type': 'arc', 'tooltip': True},
+        'encoding': {
+            'theta': {'field': 'count', 'type': 'quantitative'},
+            'color': {
+                'field': 'role', 'type': 'nominal', 'title': "Role",
+                'scale': {'range': ['#4caf50', '#ff9800', '#9c27b0', '#f44336']}
+            }
+        }
+    }
+
+def _tier_bar_spec(counts: tuple) -> Dict:
+    """Vega-Lite spec for the subscription tier distribution bar chart"""
+    return {
+        'title': "Subscription Tier Distribution",
+        'data': {'values': [{'tier': tier, 'count': n} for tier, n in counts]},
+        'mark': {'type': 'bar', 'tooltip': True},
+        'encoding': {
+            'x': {'field': 'tier', 'type': 'nominal', 'sort': _TIERS, 'title': "Subscription Tier"},
+            'y': {'field': 'count', 'type': 'quantitative', 'title': "Number of Users"},
+            'color': {
+                'field': 'tier', 'type': 'nominal', 'legend': None,
+                'scale': {'domain': _TIERS, 'range': ['#4caf50', '#ff9800', '#9c27b0']}
+            }
+        }
+    }
+
+def show_users_overview(users_df: pd.DataFrame, fingerprint: str):
     """Show comprehensive user overview with statistics"""
     
     st.markdown("### 📊 User Overview")
     
-    # Calculate comprehensive statistics
-    total_users = len(users)
-    admin_users = len([u for u in users if u.get('role') == 'admin'])
-    moderator_users = len([u for u in users if u.get('role') == 'moderator'])
-    active_users = len([u for u in users if u.get('is_active', True)])
-    verified_users = len([u for u in users if u.get('email_confirmed_at')])
-    pending_approvals = len([u for u in users if u.get('pending_approval', False)])
-    
-    # Subscription stats
-    free_users = len([u for u in users if u.get('subscription_tier') == 'free'])
-    pro_users = len([u for u in users if u.get('subscription_tier') == 'pro'])
-    enterprise_users = len([u for u in users if u.get('subscription_tier') == 'enterprise'])
-    
-    # Activity stats
-    active_today = len([u for u in users if calculate_activity_score(u.get('last_sign_in_at', '')) == "Today"])
-    active_week = len([u for u in users if calculate_activity_score(u.get('last_sign_in_at', '')) in ["Today", "Yesterday"] or "days ago" in calculate_activity_score(u.get('last_sign_in_at', ''))])
-    
-    # Revenue and usage
-    total_revenue = sum([u.get('total_cost', 0) for u in users])
-    total_tokens = sum([u.get('tokens_used', 0) for u in users])
-    total_api_requests = sum([u.get('api_requests', 0) for u in users])
+    # Calculate comprehensive statistics once per dataset
+    stats = _compute_overview_stats(fingerprint, users_df)
     
     # Main stats cards
     st.markdown("#### 📈 Key Metrics")
@@ -118,47 +266,47 @@ def show_users_overview(users: List[Dict]):
     with col1:
         create_metric_card(
             "Total Users",
-            str(total_users),
-            f"{active_users} active",
+            str(stats['total_users']),
+            f"{stats['active_users']} active",
             "#4caf50"
         )
     
     with col2:
         create_metric_card(
             "Admins",
-            str(admin_users),
-            f"{moderator_users} moderators",
+            str(stats['admin_users']),
+            f"{stats['moderator_users']} moderators",
             "#ff9800"
         )
     
     with col3:
         create_metric_card(
             "Verified",
-            str(verified_users),
-            f"{(verified_users/max(total_users,1)*100):.1f}% of total",
+            str(stats['verified_users']),
+            f"{(stats['verified_users']/max(stats['total_users'],1)*100):.1f}% of total",
             "#4caf50"
         )
     
     with col4:
         create_metric_card(
             "Pending",
-            str(pending_approvals),
+            str(stats['pending_approvals']),
             "Awaiting approval",
-            "#ff9800" if pending_approvals > 0 else "#4caf50"
+            "#ff9800" if stats['pending_approvals'] > 0 else "#4caf50"
         )
     
     with col5:
         create_metric_card(
             "Active Today",
-            str(active_today),
-            f"{active_week} this week",
+            str(stats['active_today']),
+            f"{stats['active_week']} this week",
             "#4caf50"
         )
     
     with col6:
         create_metric_card(
             "Total Revenue",
-            format_currency(total_revenue),
+            format_currency(stats['total_revenue']),
             "All time",
             "#2e7d32"
         )
@@ -170,31 +318,31 @@ def show_users_overview(users: List[Dict]):
     with col7:
         create_metric_card(
             "Free Users",
-            str(free_users),
-            f"{(free_users/max(total_users,1)*100):.1f}%",
+            str(stats['free_users']),
+            f"{(stats['free_users']/max(stats['total_users'],1)*100):.1f}%",
             "#4caf50"
         )
     
     with col8:
         create_metric_card(
             "Pro Users",
-            str(pro_users),
-            f"{(pro_users/max(total_users,1)*100):.1f}%",
+            str(stats['pro_users']),
+            f"{(stats['pro_users']/max(stats['total_users'],1)*100):.1f}%",
             "#ff9800"
         )
     
     with col9:
         create_metric_card(
             "Enterprise",
-            str(enterprise_users),
-            f"{(enterprise_users/max(total_users,1)*100):.1f}%",
+            str(stats['enterprise_users']),
+            f"{(stats['enterprise_users']/max(stats['total_users'],1)*100):.1f}%",
             "#9c27b0"
         )
     
     with col10:
         create_metric_card(
             "Total Tokens",
-            f"{total_tokens:,}",
+            f"{stats['total_tokens']:,}",
             "All users",
             "#2e7d32"
         )
@@ -202,13 +350,13 @@ def show_users_overview(users: List[Dict]):
     with col11:
         create_metric_card(
             "API Requests",
-            f"{total_api_requests:,}",
+            f"{stats['total_api_requests']:,}",
             "All time",
             "#2e7d32"
         )
     
     with col12:
-        avg_revenue = total_revenue / max(total_users, 1)
+        avg_revenue = stats['total_revenue'] / max(stats['total_users'], 1)
         create_metric_card(
             "Avg Revenue",
             format_currency(avg_revenue),
@@ -217,51 +365,42 @@ def show_users_overview(users: List[Dict]):
         )
     
     # Visual analytics
-    if users:
+    if stats['total_users']:
         st.markdown("#### 📊 Visual Analytics")
         chart_col1, chart_col2 = st.columns(2)
         
         with chart_col1:
             # Role distribution pie chart
-            role_counts = {}
-            for user in users:
-                role = user.get('role', 'user')
-                role_counts[role] = role_counts.get(role, 0) + 1
-            
-            fig_roles = px.pie(
-                values=list(role_counts.values()),
-                names=list(role_counts.keys()),
-                title="User Role Distribution",
-                color_discrete_sequence=['#4caf50', '#ff9800', '#9c27b0', '#f44336']
-            )
-            fig_roles.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333')
-            )
-            st.plotly_chart(fig_roles, use_container_width=True)
+            st.vega_lite_chart(spec=_role_pie_spec(stats['role_counts']), use_container_width=True)
         
         with chart_col2:
             # Subscription tier distribution
-            tier_counts = {'free': free_users, 'pro': pro_users, 'enterprise': enterprise_users}
-            
-            fig_tiers = px.bar(
-                x=list(tier_counts.keys()),
-                y=list(tier_counts.values()),
-                title="Subscription Tier Distribution",
-                color=list(tier_counts.keys()),
-                color_discrete_sequence=['#4caf50', '#ff9800', '#9c27b0']
-            )
-            fig_tiers.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333'),
-                xaxis_title="Subscription Tier",
-                yaxis_title="Number of Users"
-            )
-            st.plotly_chart(fig_tiers, use_container_width=True)
+            st.vega_lite_chart(spec=_tier_bar_spec(stats['tier_counts']), use_container_width=True)
+
+# Columns shown in the paged user listing
+_LISTING_COLUMNS = [
+    'id', 'full_name', 'email', 'role', 'subscription_tier',
+    'is_active', 'tokens_used', 'total_cost', '_activity_score'
+]
+_LISTING_COLUMN_CONFIG = {
+    'id': None,
+    'full_name': st.column_config.TextColumn("Name"),
+    'email': st.column_config.TextColumn("Email"),
+    'role': st.column_config.TextColumn("Role"),
+    'subscription_tier': st.column_config.TextColumn("Subscription"),
+    'is_active': st.column_config.CheckboxColumn("Active"),
+    'tokens_used': st.column_config.NumberColumn("Tokens Used", format="%d"),
+    'total_cost': st.column_config.NumberColumn("Total Cost", format="$%.2f"),
+    '_activity_score': st.column_config.TextColumn("Last Login")
+}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _users_csv(fingerprint: str, filter_key: tuple, _users: List[Dict]) -> bytes:
+    """CSV export of a filtered user list, reused until the data or filters change"""
+    df = pd.DataFrame(_users)
+    return df.drop(columns=[c for c in df.columns if c.startswith('_')]).to_csv(index=False).encode()
 
-def show_all_users(users: List[Dict], db: DatabaseManager):
+def show_all_users(users: List[Dict], users_df: pd.DataFrame, fingerprint: str, db: DatabaseManager):
     """Show all users with filtering and management options"""
     
     st.markdown("### 👥 All Users")
@@ -293,106 +432,123 @@ def show_all_users(users: List[Dict], db: DatabaseManager):
     
     # Additional activity filter
     if activity_filter != "All":
+        age_days = users_df['_age_days']
         if activity_filter == "Active Today":
-            filtered_users = [u for u in filtered_users if calculate_activity_score(u.get('last_sign_in_at', '')) == "Today"]
+            activity_mask = age_days.eq(0)
         elif activity_filter == "Active This Week":
-            filtered_users = [u for u in filtered_users if calculate_activity_score(u.get('last_sign_in_at', '')) in ["Today", "Yesterday"] or "days ago" in calculate_activity_score(u.get('last_sign_in_at', ''))]
-        elif activity_filter == "Inactive":
-            filtered_users = [u for u in filtered_users if calculate_activity_score(u.get('last_sign_in_at', '')) in ["Never"] or "months ago" in calculate_activity_score(u.get('last_sign_in_at', '')) or "years ago" in calculate_activity_score(u.get('last_sign_in_at', ''))]
+            activity_mask = age_days.le(7)
+        else:
+            activity_mask = age_days.gt(30) | age_days.isna()
+        matching_ids = set(users_df.loc[activity_mask, 'id'])
+        filtered_users = [u for u in filtered_users if u.get('id') in matching_ids]
     
     st.markdown(f"**Showing {len(filtered_users)} of {len(users)} users**")
     
     # Pagination
     users_per_page = 10
-    pagination_data = paginate_data(filtered_users, 1, users_per_page)
-    
-    if pagination_data['total_pages'] > 1:
-        page = st.selectbox("Page", range(1, pagination_data['total_pages'] + 1))
-        pagination_data = paginate_data(filtered_users, page, users_per_page)
+    total_pages = max(1, (len(filtered_users) + users_per_page - 1) // users_per_page)
+    page = st.selectbox("Page", range(1, total_pages + 1)) if total_pages > 1 else 1
+    start = (page - 1) * users_per_page
+    page_users = filtered_users[start:start + users_per_page]
     
     # Export options
     col_export1, col_export2, col_export3 = st.columns([1, 1, 4])
     
     with col_export1:
-        if st.button("📥 Export CSV"):
-            csv_data = export_data_to_csv(filtered_users, "users_export.csv")
-            st.download_button(
-                label="Download CSV",
-                data=csv_data,
-                file_name=f"users_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+        filter_key = (role_filter, status_filter, tier_filter, activity_filter, search_term)
+        st.download_button(
+            label="📥 Export CSV",
+            data=_users_csv(fingerprint, filter_key, filtered_users),
+            file_name=f"users_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
     
     with col_export2:
         if st.button("📊 Generate Report"):
             st.info("Detailed user report would be generated here")
     
-    # Show user cards
-    for user in pagination_data['data']:
-        render_enhanced_user_card(user, db)
+    # Show the page as one table, with full management for the selected user
+    page_df = pd.DataFrame(page_users, columns=_LISTING_COLUMNS)
+    st.dataframe(
+        page_df,
+        column_config=_LISTING_COLUMN_CONFIG,
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    selected = st.selectbox(
+        "Inspect user",
+        options=range(len(page_users)),
+        index=None,
+        format_func=lambda i: f"{page_users[i].get('full_name', 'Unnamed User')} ({page_users[i].get('email', 'No email')})",
+        placeholder="Select a user to manage..."
+    )
+    if selected is not None:
+        render_enhanced_user_card(page_users[selected], db)
 
 def render_enhanced_user_card(user: Dict, db: DatabaseManager):
     """Render an enhanced user card with all management options"""
     
+    g = user.get
+    
     # Determine card class based on user role and status
     card_classes = ["user-card"]
     
-    if user.get('role') == 'admin':
+    if g('role') == 'admin':
         card_classes.append("admin-card")
-    elif user.get('role') == 'moderator':
+    elif g('role') == 'moderator':
         card_classes.append("moderator-card")
-    elif user.get('pending_approval', False):
+    elif g('pending_approval', False):
         card_classes.append("pending-card")
-    elif user.get('subscription_tier') in ['pro', 'enterprise']:
+    elif g('subscription_tier') in ['pro', 'enterprise']:
         card_classes.append("premium-card")
     
     card_class = " ".join(card_classes)
     
     # Format data
-    created_date = safe_date_format(user.get('created_at', ''), '%Y-%m-%d')
-    last_login = safe_date_format(user.get('last_sign_in_at', ''), '%Y-%m-%d %H:%M')
-    activity_score = calculate_activity_score(user.get('last_sign_in_at', ''))
+    created_date = _format_ts(user['_created_at_dt'], '%Y-%m-%d')
+    activity_score = user['_activity_score']
     activity_class = get_activity_class(activity_score)
-    role_color = get_role_color(user.get('role', 'user'))
+    role_color = get_role_color(g('role', 'user'))
     
     # Create expandable user card
-    with st.expander(f"👤 {user.get('full_name', 'Unnamed User')} ({user.get('email', 'No email')})", expanded=False):
+    with st.expander(f"👤 {g('full_name', 'Unnamed User')} ({g('email', 'No email')})", expanded=True):
         
         # Main user info
         col1, col2, col3, col4 = st.columns([2, 2, 2, 2])
         
         with col1:
             st.markdown("**Basic Information:**")
-            st.write(f"• **User ID:** {user.get('id', 'N/A')[:8]}...")
-            st.write(f"• **Username:** {user.get('username', 'Not set')}")
-            st.write(f"• **Full Name:** {user.get('full_name', 'Not set')}")
-            st.write(f"• **Email:** {user.get('email', 'No email')}")
-            if user.get('website'):
+            st.write(f"• **User ID:** {g('id', 'N/A')[:8]}...")
+            st.write(f"• **Username:** {g('username', 'Not set')}")
+            st.write(f"• **Full Name:** {g('full_name', 'Not set')}")
+            st.write(f"• **Email:** {g('email', 'No email')}")
+            if g('website'):
                 st.write(f"• **Website:** [Link]({user['website']})")
         
         with col2:
             st.markdown("**Account Details:**")
-            st.write(f"• **Role:** {user.get('role', 'user').title()}")
-            st.write(f"• **Subscription:** {user.get('subscription_tier', 'free').title()}")
-            st.write(f"• **Status:** {'Active' if user.get('is_active', True) else 'Inactive'}")
-            st.write(f"• **Email Verified:** {'Yes' if user.get('email_confirmed_at') else 'No'}")
+            st.write(f"• **Role:** {g('role', 'user').title()}")
+            st.write(f"• **Subscription:** {g('subscription_tier', 'free').title()}")
+            st.write(f"• **Status:** {'Active' if g('is_active', True) else 'Inactive'}")
+            st.write(f"• **Email Verified:** {'Yes' if g('email_confirmed_at') else 'No'}")
             st.write(f"• **Created:** {created_date}")
         
         with col3:
             st.markdown("**Usage Statistics:**")
-            st.write(f"• **Tokens Used:** {user.get('tokens_used', 0):,}")
-            st.write(f"• **Total Cost:** {format_currency(user.get('total_cost', 0))}")
-            st.write(f"• **API Requests:** {user.get('api_requests', 0):,}")
-            st.write(f"• **Chat Threads:** {user.get('chat_threads_count', 0)}")
-            st.write(f"• **File Uploads:** {user.get('file_uploads_count', 0)}")
+            st.write(f"• **Tokens Used:** {g('tokens_used', 0):,}")
+            st.write(f"• **Total Cost:** {format_currency(g('total_cost', 0))}")
+            st.write(f"• **API Requests:** {g('api_requests', 0):,}")
+            st.write(f"• **Chat Threads:** {g('chat_threads_count', 0)}")
+            st.write(f"• **File Uploads:** {g('file_uploads_count', 0)}")
         
         with col4:
             st.markdown("**Activity & Features:**")
             st.write(f"• **Last Login:** {activity_score}")
-            st.write(f"• **Activity Logs:** {user.get('activity_logs_count', 0)}")
-            st.write(f"• **Custom Assistants:** {user.get('custom_assistants_count', 0)}")
-            st.write(f"• **Voice Enabled:** {'Yes' if user.get('voice_enabled') else 'No'}")
-            st.write(f"• **Advanced Features:** {'Yes' if user.get('advanced_features') else 'No'}")
+            st.write(f"• **Activity Logs:** {g('activity_logs_count', 0)}")
+            st.write(f"• **Custom Assistants:** {g('custom_assistants_count', 0)}")
+            st.write(f"• **Voice Enabled:** {'Yes' if g('voice_enabled') else 'No'}")
+            st.write(f"• **Advanced Features:** {'Yes' if g('advanced_features') else 'No'}")
         
         # Detailed tabs
         detail_tab1, detail_tab2, detail_tab3, detail_tab4 = st.tabs(["🔧 Actions", "📊 Analytics", "🔒 Security", "📋 Logs"])
@@ -412,13 +568,15 @@ def render_enhanced_user_card(user: Dict, db: DatabaseManager):
 def show_user_actions(user: Dict, db: DatabaseManager):
     """Show user management actions"""
     
+    g = user.get
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.markdown("**Account Management**")
         
         # Role management
-        current_role = user.get('role', 'user')
+        current_role = g('role', 'user')
         new_role = st.selectbox(
             "Change Role",
             options=['user', 'moderator', 'admin'],
@@ -430,14 +588,15 @@ def show_user_actions(user: Dict, db: DatabaseManager):
             if st.button(f"Update Role to {new_role.title()}", key=f"update_role_{user['id']}"):
                 if db.update_user_role(user['id'], new_role):
                     st.success(f"✅ Role updated to {new_role}")
+                    _clear_user_cache()
                     st.rerun()
                 else:
                     st.error("❌ Failed to update role")
         
         # Account status
-        if user.get('is_active', True):
+        if g('is_active', True):
             if st.button("🔒 Deactivate Account", key=f"deactivate_{user['id']}", type="secondary"):
-                if show_confirmation_dialog(f"Deactivate account for {user.get('email', 'user')}?", f"deactivate_{user['id']}"):
+                if show_confirmation_dialog(f"Deactivate account for {g('email', 'user')}?", f"deactivate_{user['id']}"):
                     st.success("✅ Account deactivated")
         else:
             if st.button("✅ Activate Account", key=f"activate_{user['id']}"):
@@ -446,22 +605,24 @@ def show_user_actions(user: Dict, db: DatabaseManager):
     with col2:
         st.markdown("**Approval Actions**")
         
-        if user.get('pending_approval', False):
+        if g('pending_approval', False):
             col2a, col2b = st.columns(2)
             
             with col2a:
                 if st.button("✅ Approve", key=f"approve_{user['id']}"):
-                    if db.approve_user(user['id'], user.get('email', '')):
+                    if db.approve_user(user['id'], g('email', '')):
                         st.success("✅ User approved")
+                        _clear_user_cache()
                         st.rerun()
                     else:
                         st.error("❌ Failed to approve user")
             
             with col2b:
                 if st.button("❌ Reject", key=f"reject_{user['id']}", type="secondary"):
-                    if show_confirmation_dialog(f"Reject user {user.get('email', 'user')}?", f"reject_{user['id']}"):
-                        if db.reject_user(user['id'], user.get('email', '')):
+                    if show_confirmation_dialog(f"Reject user {g('email', 'user')}?", f"reject_{user['id']}"):
+                        if db.reject_user(user['id'], g('email', '')):
                             st.success("✅ User rejected")
+                            _clear_user_cache()
                             st.rerun()
                         else:
                             st.error("❌ Failed to reject user")
@@ -482,7 +643,7 @@ def show_user_actions(user: Dict, db: DatabaseManager):
             st.info("Password reset email would be sent")
         
         if st.button("🗑️ Delete Account", key=f"delete_{user['id']}", type="secondary"):
-            if show_confirmation_dialog(f"Permanently delete account for {user.get('email', 'user')}? This cannot be undone.", f"delete_{user['id']}"):
+            if show_confirmation_dialog(f"Permanently delete account for {g('email', 'user')}? This cannot be undone.", f"delete_{user['id']}"):
                 st.error("Account deletion would be processed here")
 
 def show_user_analytics_detail(user: Dict):
@@ -555,29 +716,20 @@ def show_user_analytics_detail(user: Dict):
 def show_user_security_detail(user: Dict):
     """Show user security details"""
     
+    g = user.get
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("**Security Information**")
         
-        st.write(f"• **Account Created:** {safe_date_format(user.get('created_at', ''), '%B %d, %Y at %I:%M %p')}")
-        st.write(f"• **Email Verified:** {'Yes' if user.get('email_confirmed_at') else 'No'}")
-        st.write(f"• **Last Login:** {safe_date_format(user.get('last_sign_in_at', ''), '%B %d, %Y at %I:%M %p')}")
-        st.write(f"• **Two-Factor Auth:** {'Enabled' if user.get('two_factor_enabled') else 'Disabled'}")
-        st.write(f"• **Failed Login Attempts:** {user.get('failed_login_attempts', 0)}")
-        
-        # Security score
-        security_score = 0
-        if user.get('email_confirmed_at'):
-            security_score += 25
-        if user.get('two_factor_enabled'):
-            security_score += 25
-        if user.get('last_sign_in_at'):
-            security_score += 25
-        if len(user.get('password', '')) >= 8:  # Placeholder check
-            security_score += 25
-        
-        st.write(f"• **Security Score:** {security_score}/100")
+        st.write(f"• **Account Created:** {_format_ts(user['_created_at_dt'], '%B %d, %Y at %I:%M %p')}")
+        st.write(f"• **Email Verified:** {'Yes' if g('email_confirmed_at') else 'No'}")
+        st.write(f"• **Last Login:** {_format_ts(user['_last_sign_in_dt'], '%B %d, %Y at %I:%M %p')}")
+        st.write(f"• **Two-Factor Auth:** {'Enabled' if g('two_factor_enabled') else 'Disabled'}")
+        st.write(f"• **Failed Login Attempts:** {g('failed_login_attempts', 0)}")
+        
+        st.write(f"• **Security Score:** {user['_security_score']}/100")
     
     with col2:
         st.markdown("**Security Actions**")
@@ -621,6 +773,32 @@ def show_user_logs_detail(user: Dict):
     if st.button("📥 Export Full Activity Log", key=f"export_logs_{user['id']}"):
         st.info("Full activity log export would be generated here")
 
+# Upper bound on concurrent Supabase calls for bulk approve/reject
+_BULK_WORKERS = 8
+
+def _apply_to_user(action, user: Dict) -> Tuple[Dict, bool, str]:
+    """Run one database action and report (user, ok, error) without touching the UI"""
+    try:
+        return user, bool(action(user['id'], user.get('email', ''))), ""
+    except Exception as e:
+        return user, False, str(e)
+
+def _apply_to_users(action, users: List[Dict]) -> Tuple[int, List[Tuple[Dict, str]]]:
+    """Run a per-user database action concurrently; return the success count and failures"""
+    # Worker threads have no script context, so results are rendered by the caller
+    with ThreadPoolExecutor(max_workers=min(_BULK_WORKERS, len(users))) as executor:
+        results = list(executor.map(lambda u: _apply_to_user(action, u), users))
+    
+    failures = [(user, error) for user, ok, error in results if not ok]
+    return len(results) - len(failures), failures
+
+def _show_bulk_failures(verb: str, failures: List[Tuple[Dict, str]]):
+    """Report each user a bulk action failed for"""
+    for user, error in failures:
+        detail = f": {error}" if error else ""
+        st.error(f"❌ Failed to {verb} {user.get('email') or user['id']}{detail}")
+
+@st.fragment
 def show_pending_approvals(users: List[Dict], db: DatabaseManager):
     """Show pending user approvals"""
     
@@ -637,41 +815,56 @@ def show_pending_approvals(users: List[Dict], db: DatabaseManager):
         with col1:
             if st.button("✅ Approve All"):
                 if show_confirmation_dialog(f"Approve all {len(pending_users)} pending users?", "approve_all"):
-                    approved_count = 0
-                    for user in pending_users:
-                        if db.approve_user(user['id'], user.get('email', '')):
-                            approved_count += 1
+                    approved_count, failures = _apply_to_users(db.approve_user, pending_users)
                     st.success(f"✅ Approved {approved_count} users")
-                    st.rerun()
+                    _clear_user_cache()
+                    if failures:
+                        _show_bulk_failures("approve", failures)
+                    else:
+                        st.rerun()
         
         with col2:
             if st.button("❌ Reject All", type="secondary"):
                 if show_confirmation_dialog(f"Reject all {len(pending_users)} pending users?", "reject_all"):
-                    rejected_count = 0
-                    for user in pending_users:
-                        if db.reject_user(user['id'], user.get('email', '')):
-                            rejected_count += 1
+                    rejected_count, failures = _apply_to_users(db.reject_user, pending_users)
                     st.success(f"✅ Rejected {rejected_count} users")
-                    st.rerun()
+                    _clear_user_cache()
+                    if failures:
+                        _show_bulk_failures("reject", failures)
+                    else:
+                        st.rerun()
         
-        # Individual pending users
-        for user in pending_users:
-            render_pending_user_card(user, db)
+        # Individual pending users as one HTML block
+        st.markdown("\n".join(_pending_card_html(user) for user in pending_users), unsafe_allow_html=True)
+        
+        # Actions for the pending user the admin picks
+        selected = st.selectbox(
+            "Review user",
+            options=range(len(pending_users)),
+            index=None,
+            format_func=lambda i: f"{pending_users[i].get('full_name', 'Unnamed User')} ({pending_users[i].get('email', 'No email')})",
+            placeholder="Select a pending user to act on...",
+            key="pending_review_user"
+        )
+        if selected is not None:
+            render_pending_user_actions(pending_users[selected], db)
     else:
         st.success("🎉 No pending approvals!")
         st.info("All users have been processed. New registrations will appear here.")
 
-def render_pending_user_card(user: Dict, db: DatabaseManager):
-    """Render a card for pending user approval"""
+def _pending_card_html(user: Dict) -> str:
+    """HTML card for a user pending approval"""
     
-    created_date = safe_date_format(user.get('created_at', ''), '%B %d, %Y at %I:%M %p')
+    g = user.get
     
-    st.markdown(f"""
+    created_date = _format_ts(user['_created_at_dt'], '%B %d, %Y at %I:%M %p')
+    
+    return f"""
     <div class="pending-card">
         <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 15px;">
             <div>
-                <h4 style="margin: 0; color: #333;">{user.get('full_name', 'Unnamed User')}</h4>
-                <p style="margin: 5px 0; color: #666;">{user.get('email', 'No email')}</p>
+                <h4 style="margin: 0; color: #333;">{g('full_name', 'Unnamed User')}</h4>
+                <p style="margin: 5px 0; color: #666;">{g('email', 'No email')}</p>
                 <small style="color: #888;">Registered: {created_date}</small>
             </div>
             <div>
@@ -680,36 +873,42 @@ def render_pending_user_card(user: Dict, db: DatabaseManager):
                 </span>
             </div>
         </div>
-        
         <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px; margin-bottom: 15px;">
             <div>
-                <p style="margin: 0; color: #666; font-size: 0.9rem;"><strong>Subscription:</strong> {user.get('subscription_tier', 'free').title()}</p>
-                <p style="margin: 5px 0 0 0; color: #666; font-size: 0.9rem;"><strong>Email Verified:</strong> {'Yes' if user.get('email_confirmed_at') else 'No'}</p>
+                <p style="margin: 0; color: #666; font-size: 0.9rem;"><strong>Subscription:</strong> {g('subscription_tier', 'free').title()}</p>
+                <p style="margin: 5px 0 0 0; color: #666; font-size: 0.9rem;"><strong>Email Verified:</strong> {'Yes' if g('email_confirmed_at') else 'No'}</p>
             </div>
             <div>
-                <p style="margin: 0; color: #666; font-size: 0.9rem;"><strong>User ID:</strong> {user.get('id', 'N/A')[:8]}...</p>
-                <p style="margin: 5px 0 0 0; color: #666; font-size: 0.9rem;"><strong>Username:</strong> {user.get('username', 'Not set')}</p>
+                <p style="margin: 0; color: #666; font-size: 0.9rem;"><strong>User ID:</strong> {g('id', 'N/A')[:8]}...</p>
+                <p style="margin: 5px 0 0 0; color: #666; font-size: 0.9rem;"><strong>Username:</strong> {g('username', 'Not set')}</p>
             </div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+def render_pending_user_actions(user: Dict, db: DatabaseManager):
+    """Render approval actions for a pending user"""
+    
+    g = user.get
     
     # Action buttons
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         if st.button("✅ Approve", key=f"approve_pending_{user['id']}"):
-            if db.approve_user(user['id'], user.get('email', '')):
+            if db.approve_user(user['id'], g('email', '')):
                 st.success("✅ User approved")
+                _clear_user_cache()
                 st.rerun()
             else:
                 st.error("❌ Failed to approve user")
     
     with col2:
         if st.button("❌ Reject", key=f"reject_pending_{user['id']}", type="secondary"):
-            if show_confirmation_dialog(f"Reject user {user.get('email', 'user')}?", f"reject_pending_{user['id']}"):
-                if db.reject_user(user['id'], user.get('email', '')):
+            if show_confirmation_dialog(f"Reject user {g('email', 'user')}?", f"reject_pending_{user['id']}"):
+                if db.reject_user(user['id'], g('email', '')):
                     st.success("✅ User rejected")
+                    _clear_user_cache()
                     st.rerun()
                 else:
                     st.error("❌ Failed to reject user")
@@ -722,12 +921,100 @@ def render_pending_user_card(user: Dict, db: DatabaseManager):
         if st.button("📋 Details", key=f"details_pending_{user['id']}"):
             st.info("Detailed view would be shown here")
 
-def show_user_analytics(users: List[Dict]):
+@st.cache_data(ttl=300, show_spinner=False)
+def _registration_series(total_users: int) -> Tuple[tuple, tuple]:
+    """Sample daily registrations for the last 30 days"""
+    dates = tuple((datetime.now() - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(30, 0, -1))
+    daily_registrations = tuple(max(0, total_users // 30 + (i % 7)) for i in range(30))
+    return dates, daily_registrations
+
+@st.cache_data(show_spinner=False)
+def _build_registrations_line(dates: tuple, daily_registrations: tuple) -> go.Figure:
+    """Daily registrations line chart"""
+    fig = px.line(
+        x=list(dates),
+        y=list(daily_registrations),
+        title="Daily Registrations (Last 30 Days)",
+        labels={'x': 'Date', 'y': 'New Registrations'}
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333'),
+        showlegend=False
+    )
+    fig.update_traces(line_color='#4caf50', line_width=3)
+    return fig
+
+# Upper cost bounds of the Inactive, Low Value and Medium Value segments
+_SEGMENT_BINS = [0, 10, 50]
+_SEGMENT_NAMES = ('High Value', 'Medium Value', 'Low Value', 'Inactive')
+
+_MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _compute_revenue_projection(total_revenue: float) -> np.ndarray:
+    """Twelve-month revenue projection from the all-time total"""
+    return (total_revenue / 12) * (1 + (np.arange(12) % 4) * 0.1)
+
+@st.cache_data(max_entries=16, ttl=300, show_spinner=False)
+def _build_heatmap_fig(fingerprint: str, _users_df: pd.DataFrame) -> go.Figure:
+    """Activity heatmap over the first 20 users"""
+    sample = _users_df.head(20)
+    fig = px.imshow(
+        sample[['tokens_used', 'chat_threads_count', 'file_uploads_count']].to_numpy().T,
+        x=sample['full_name'].astype(str).str.slice(0, 15).tolist(),
+        y=['Tokens', 'Threads', 'Files'],
+        labels=dict(x="User", color="value"),
+        title="User Activity Heatmap",
+        color_continuous_scale='Greens'
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333'),
+        height=400
+    )
+    return fig
+
+@st.cache_data(max_entries=16, ttl=300, show_spinner=False)
+def _build_revenue_fig(total_revenue: float) -> go.Figure:
+    """Monthly revenue projection bar chart"""
+    monthly_revenue = _compute_revenue_projection(total_revenue).tolist()
+    fig = go.Figure(go.Bar(
+        x=_MONTHS,
+        y=monthly_revenue,
+        marker=dict(color=monthly_revenue, colorscale='Greens')
+    ))
+    fig.update_layout(
+        title="Monthly Revenue Projection",
+        xaxis_title="Month",
+        yaxis_title="Revenue ($)",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333'),
+        showlegend=False
+    )
+    return fig
+
+@st.cache_data(max_entries=16, ttl=300, show_spinner=False)
+def _build_segments_fig(segment_sizes: tuple) -> go.Figure:
+    """User value segmentation pie chart, sizes in _SEGMENT_NAMES order"""
+    fig = go.Figure(go.Pie(labels=_SEGMENT_NAMES, values=segment_sizes))
+    fig.update_layout(
+        title="User Value Segmentation",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333')
+    )
+    return fig
+
+def show_user_analytics(users_df: pd.DataFrame, fingerprint: str):
     """Show comprehensive user analytics"""
     
     st.markdown("### 📈 User Analytics")
     
-    if not users:
+    if users_df.empty:
         st.warning("No user data available for analytics")
         return
     
@@ -739,106 +1026,147 @@ def show_user_analytics(users: List[Dict]):
         st.markdown("#### 📅 Registration Trends")
         
         # Generate sample registration data based on user creation dates
-        dates = [(datetime.now() - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(30, 0, -1)]
-        daily_registrations = [max(0, len(users) // 30 + (i % 7)) for i in range(30)]
-        
-        fig_registrations = px.line(
-            x=dates,
-            y=daily_registrations,
-            title="Daily Registrations (Last 30 Days)",
-            labels={'x': 'Date', 'y': 'New Registrations'}
-        )
-        fig_registrations.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#333'),
-            showlegend=False
-        )
-        fig_registrations.update_traces(line_color='#4caf50', line_width=3)
-        st.plotly_chart(fig_registrations, use_container_width=True)
+        dates, daily_registrations = _registration_series(len(users_df))
+        st.plotly_chart(_build_registrations_line(dates, daily_registrations), use_container_width=True)
         
         # Activity heatmap
         st.markdown("#### 🔥 Activity Heatmap")
         
-        # Sample activity data
-        activity_data = []
-        for user in users[:20]:  # Sample of users
-            activity_data.append({
-                'User': user.get('full_name', 'User')[:15],
-                'Tokens': user.get('tokens_used', 0),
-                'Threads': user.get('chat_threads_count', 0),
-                'Files': user.get('file_uploads_count', 0)
-            })
-        
-        if activity_data:
-            df_activity = pd.DataFrame(activity_data)
-            fig_heatmap = px.imshow(
-                df_activity.set_index('User').T,
-                title="User Activity Heatmap",
-                color_continuous_scale='Greens'
-            )
-            fig_heatmap.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#333'),
-                height=400
-            )
-            st.plotly_chart(fig_heatmap, use_container_width=True)
+        st.plotly_chart(_build_heatmap_fig(fingerprint, users_df), use_container_width=True)
     
     with col2:
         # Revenue analysis
         st.markdown("#### 💰 Revenue Analysis")
         
-        total_revenue = sum([u.get('total_cost', 0) for u in users])
-        monthly_revenue = [total_revenue / 12 * (1 + (i % 4) * 0.1) for i in range(12)]
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        
-        fig_revenue = px.bar(
-            x=months,
-            y=monthly_revenue,
-            title="Monthly Revenue Projection",
-            labels={'x': 'Month', 'y': 'Revenue ($)'},
-            color=monthly_revenue,
-            color_continuous_scale='Greens'
-        )
-        fig_revenue.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#333'),
-            showlegend=False
-        )
-        st.plotly_chart(fig_revenue, use_container_width=True)
+        soa = _users_to_soa(fingerprint, users_df)
+        st.plotly_chart(_build_revenue_fig(float(soa['total_cost'].sum())), use_container_width=True)
         
         # User segmentation
         st.markdown("#### 🎯 User Segmentation")
         
-        # Segment users by usage
-        segments = {'High Value': 0, 'Medium Value': 0, 'Low Value': 0, 'Inactive': 0}
-        
-        for user in users:
-            cost = user.get('total_cost', 0)
-            if cost > 50:
-                segments['High Value'] += 1
-            elif cost > 10:
-                segments['Medium Value'] += 1
-            elif cost > 0:
-                segments['Low Value'] += 1
-            else:
-                segments['Inactive'] += 1
-        
-        fig_segments = px.pie(
-            values=list(segments.values()),
-            names=list(segments.keys()),
-            title="User Value Segmentation"
-        )
-        fig_segments.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#333')
-        )
-        st.plotly_chart(fig_segments, use_container_width=True)
+        # Segment users by usage: cost <= 0, <= $10, <= $50, above $50
+        segment_codes = np.digitize(soa['total_cost'], _SEGMENT_BINS, right=True)
+        segment_sizes = tuple(np.bincount(segment_codes, minlength=4)[::-1].tolist())
+        st.plotly_chart(_build_segments_fig(segment_sizes), use_container_width=True)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _users_to_soa(fingerprint: str, _users_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Contiguous per-column arrays for the bulk filters and statistics"""
+    df = _users_df
+    total_cost = df['total_cost'].to_numpy(dtype=np.float64)
+    tokens_used = df['tokens_used'].to_numpy(dtype=np.int64)
+    
+    # Reuse the timestamps parsed in _users_frame; ages are fractional days (NaN if never)
+    last_sign_in = df['_last_sign_in_dt'].dt.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+    age_days = (np.datetime64('now') - last_sign_in) / np.timedelta64(1, 'D')
+    recent = (age_days >= 0) & (age_days < 2)
+    return {
+        'total_cost': total_cost,
+        'tokens_used': tokens_used,
+        'tier': pd.Categorical(df['subscription_tier'], categories=_TIERS).codes.astype(np.int8),
+        'verified': df['email_confirmed_at'].astype(bool).to_numpy(),
+        'pending': df['pending_approval'].to_numpy(dtype=bool),
+        'last_sign_in': last_sign_in,
+        'age_days': age_days,
+        'recent': recent,
+        'inactive': age_days >= 31,
+        # Cost, tokens and recent-activity rows stacked for fused reductions
+        'stats_matrix': np.vstack([total_cost, tokens_used, recent]).astype(np.float64)
+    }
 
-def show_bulk_operations(users: List[Dict], db: DatabaseManager):
+@st.cache_data(ttl=60, show_spinner=False)
+def _compute_bulk_masks(fingerprint: str, _soa: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Boolean user mask for every bulk selection, in selectbox order"""
+    tier = _soa['tier']
+    return {
+        "All Users": np.ones(tier.size, dtype=bool),
+        "Free Users": tier == _TIERS.index('free'),
+        "Pro Users": tier == _TIERS.index('pro'),
+        "Enterprise Users": tier == _TIERS.index('enterprise'),
+        "Inactive Users (30+ days)": _soa['inactive'],
+        "Unverified Users": ~_soa['verified'],
+        "Pending Approval Users": _soa['pending']
+    }
+
+def _bulk_stats(soa: Dict[str, np.ndarray], mask: np.ndarray) -> Tuple[float, int, float]:
+    """Revenue, tokens and recently-active percentage of the masked users in one pass"""
+    selected = int(mask.sum())
+    if not selected:
+        return 0.0, 0, 0.0
+    revenue, tokens, recent = soa['stats_matrix'] @ mask.astype(np.float64)
+    return float(revenue), int(tokens), recent / selected * 100
+
+# Sample recent operations
+_RECENT_BULK_OPERATIONS = (
+    {
+        "action": "Send Welcome Email",
+        "users": 25,
+        "date": "2024-01-15 10:30:00",
+        "status": "Completed"
+    },
+    {
+        "action": "Export User Data",
+        "users": 150,
+        "date": "2024-01-14 14:20:00",
+        "status": "Completed"
+    },
+    {
+        "action": "Reset Passwords",
+        "users": 5,
+        "date": "2024-01-13 09:15:00",
+        "status": "Completed"
+    }
+)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _recent_operations_html() -> str:
+    """Recent bulk operation cards as one HTML block"""
+    return "\n".join(
+        f"""
+        <div class="feature-card">
+            <strong>{op['action']}</strong><br>
+            <small style="color: #666;">
+                {op['users']} users • {time_ago(op['date'])} • Status: {op['status']}
+            </small>
+        </div>
+        """
+        for op in _RECENT_BULK_OPERATIONS
+    )
+
+def _render_bulk_stats(soa: Dict[str, np.ndarray], target_mask: np.ndarray):
+    """Metric cards for the users selected for a bulk operation"""
+    selected = int(target_mask.sum())
+    if not selected:
+        st.info("No users match the current selection")
+        return
+    
+    total_revenue, total_tokens, avg_activity = _bulk_stats(soa, target_mask)
+    
+    create_metric_card(
+        "Selected Users",
+        str(selected),
+        f"of {target_mask.size} total"
+    )
+    
+    create_metric_card(
+        "Total Revenue",
+        format_currency(total_revenue),
+        "From selected users"
+    )
+    
+    create_metric_card(
+        "Total Tokens",
+        f"{total_tokens:,}",
+        "Used by selected users"
+    )
+    
+    create_metric_card(
+        "Active Users",
+        f"{avg_activity:.1f}%",
+        "Recently active"
+    )
+
+def show_bulk_operations(users_df: pd.DataFrame, fingerprint: str, db: DatabaseManager):
     """Show bulk operations interface"""
     
     st.markdown("### 🔧 Bulk Operations")
@@ -851,36 +1179,15 @@ def show_bulk_operations(users: List[Dict], db: DatabaseManager):
         st.markdown("#### 📤 Bulk Actions")
         
         # Select users for bulk operations
-        bulk_filter = st.selectbox(
-            "Select Users",
-            options=[
-                "All Users",
-                "Free Users",
-                "Pro Users", 
-                "Enterprise Users",
-                "Inactive Users (30+ days)",
-                "Unverified Users",
-                "Pending Approval Users"
-            ]
-        )
+        soa = _users_to_soa(fingerprint, users_df)
+        bulk_masks = _compute_bulk_masks(fingerprint, soa)
+        bulk_filter = st.selectbox("Select Users", options=list(bulk_masks))
         
-        # Filter users based on selection
-        if bulk_filter == "Free Users":
-            target_users = [u for u in users if u.get('subscription_tier') == 'free']
-        elif bulk_filter == "Pro Users":
-            target_users = [u for u in users if u.get('subscription_tier') == 'pro']
-        elif bulk_filter == "Enterprise Users":
-            target_users = [u for u in users if u.get('subscription_tier') == 'enterprise']
-        elif bulk_filter == "Inactive Users (30+ days)":
-            target_users = [u for u in users if 'months ago' in calculate_activity_score(u.get('last_sign_in_at', '')) or 'years ago' in calculate_activity_score(u.get('last_sign_in_at', ''))]
-        elif bulk_filter == "Unverified Users":
-            target_users = [u for u in users if not u.get('email_confirmed_at')]
-        elif bulk_filter == "Pending Approval Users":
-            target_users = [u for u in users if u.get('pending_approval', False)]
-        else:
-            target_users = users
+        # Every selection's mask is precomputed per dataset
+        target_mask = bulk_masks[bulk_filter]
+        target_count = int(target_mask.sum())
         
-        st.info(f"Selected: {len(target_users)} users")
+        st.info(f"Selected: {target_count} users")
         
         # Bulk actions
         bulk_action = st.selectbox(
@@ -905,76 +1212,19 @@ def show_bulk_operations(users: List[Dict], db: DatabaseManager):
         
         # Execute bulk action
         if st.button("🚀 Execute Bulk Action", type="primary"):
-            if show_confirmation_dialog(f"Execute '{bulk_action}' for {len(target_users)} users?", "bulk_execute"):
-                st.success(f"✅ Bulk action '{bulk_action}' executed for {len(target_users)} users")
+            if show_confirmation_dialog(f"Execute '{bulk_action}' for {target_count} users?", "bulk_execute"):
+                st.success(f"✅ Bulk action '{bulk_action}' executed for {target_count} users")
                 st.info("In a real implementation, this would process all selected users")
     
     with col2:
         st.markdown("#### 📊 Bulk Statistics")
         
         # Show statistics for selected users
-        if target_users:
-            total_revenue = sum([u.get('total_cost', 0) for u in target_users])
-            total_tokens = sum([u.get('tokens_used', 0) for u in target_users])
-            avg_activity = len([u for u in target_users if calculate_activity_score(u.get('last_sign_in_at', '')) in ['Today', 'Yesterday']]) / len(target_users) * 100
-            
-            create_metric_card(
-                "Selected Users",
-                str(len(target_users)),
-                f"of {len(users)} total"
-            )
-            
-            create_metric_card(
-                "Total Revenue",
-                format_currency(total_revenue),
-                "From selected users"
-            )
-            
-            create_metric_card(
-                "Total Tokens",
-                f"{total_tokens:,}",
-                "Used by selected users"
-            )
-            
-            create_metric_card(
-                "Active Users",
-                f"{avg_activity:.1f}%",
-                "Recently active"
-            )
+        _render_bulk_stats(soa, target_mask)
         
         st.markdown("#### 📋 Recent Bulk Operations")
         
-        # Sample recent operations
-        recent_operations = [
-            {
-                "action": "Send Welcome Email",
-                "users": 25,
-                "date": "2024-01-15 10:30:00",
-                "status": "Completed"
-            },
-            {
-                "action": "Export User Data",
-                "users": 150,
-                "date": "2024-01-14 14:20:00", 
-                "status": "Completed"
-            },
-            {
-                "action": "Reset Passwords",
-                "users": 5,
-                "date": "2024-01-13 09:15:00",
-                "status": "Completed"
-            }
-        ]
-        
-        for op in recent_operations:
-            st.markdown(f"""
-            <div class="feature-card">
-                <strong>{op['action']}</strong><br>
-                <small style="color: #666;">
-                    {op['users']} users • {time_ago(op['date'])} • Status: {op['status']}
-                </small>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(_recent_operations_html(), unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
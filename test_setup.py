@@ -7,12 +7,47 @@ Tests all components to ensure proper setup and functionality
 import sys
 import os
 import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Dict
+import threading
 import traceback
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Per-thread output buffer used while tests run in parallel
+_output = threading.local()
+
+def _log(message: str):
+    """Print a progress line, or buffer it when running inside the parallel runner"""
+    lines = getattr(_output, 'lines', None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+def _run_buffered(test):
+    """Run a test with its progress output buffered, returning (results, lines)"""
+    _output.lines = []
+    try:
+        return test(), _output.lines
+    finally:
+        del _output.lines
+
+def _try_import(module: str):
+    """Import a module, returning the module or the exception it raised"""
+    try:
+        return importlib.import_module(module)
+    except Exception as e:
+        return e
+
+def _import_all(modules: List[str]) -> List:
+    """Import modules one at a time, returning results in input order"""
+    # Concurrent imports race inside package init (e.g. a partially initialised
+    # pandas seen from another thread), so only the find_spec probes fan out
+    return [_try_import(module) for module in modules]
+
 def test_imports() -> List[Tuple[str, bool, str]]:
     """Test all required imports"""
     results = []
@@ -42,23 +77,27 @@ def test_imports() -> List[Tuple[str, bool, str]]:
         ('email_validator', 'Email validation'),
         ('python_dateutil', 'Date utilities'),
         ('requests', 'HTTP requests'),
+        ('plotly_resampler', 'Chart downsampling'),
+        ('orjson', 'Fast chart serialization'),
     ]
     
-    print("🔍 Testing Core Dependencies...")
-    for module, description in dependencies:
-        try:
-            importlib.import_module(module)
+    _log("🔍 Testing Core Dependencies...")
+    imported = _import_all([module for module, _ in dependencies])
+    for (module, description), result in zip(dependencies, imported):
+        if isinstance(result, Exception):
+            results.append((module, False, f"❌ {description} - {str(result)}"))
+        else:
             results.append((module, True, f"✅ {description}"))
-        except ImportError as e:
-            results.append((module, False, f"❌ {description} - {str(e)}"))
     
-    print("\n🔍 Testing Optional Dependencies...")
-    for module, description in optional_dependencies:
-        try:
-            importlib.import_module(module)
+    # Optional packages are only probed for presence, never loaded
+    _log("\n🔍 Testing Optional Dependencies...")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        specs = list(executor.map(importlib.util.find_spec, [module for module, _ in optional_dependencies]))
+    for (module, description), spec in zip(optional_dependencies, specs):
+        if spec is not None:
             results.append((module, True, f"✅ {description}"))
-        except ImportError as e:
-            results.append((module, False, f"⚠️  {description} - {str(e)} (Optional)"))
+        else:
+            results.append((module, False, f"⚠️  {description} - No module named '{module}' (Optional)"))
     
     return results
 
@@ -74,10 +113,12 @@ def test_components() -> List[Tuple[str, bool, str]]:
         ('config.settings', 'Application Settings'),
     ]
     
-    print("\n🧩 Testing Application Components...")
-    for module, description in components:
+    _log("\n🧩 Testing Application Components...")
+    imported = _import_all([module for module, _ in components])
+    for (module, description), mod in zip(components, imported):
         try:
-            mod = importlib.import_module(module)
+            if isinstance(mod, Exception):
+                raise mod
             
             # Test specific classes/functions exist
             if module == 'components.auth':
@@ -125,12 +166,21 @@ def test_file_structure() -> List[Tuple[str, bool, str]]:
         ('pages/05_👥_User_Management.py', 'User Management'),
     ]
     
-    print("\n📁 Testing File Structure...")
+    _log("\n📁 Testing File Structure...")
     
     all_files = required_files + required_pages
     
+    # One directory listing per parent directory instead of a stat per file
+    existing = set()
+    for directory in {os.path.dirname(file_path) for file_path, _ in all_files}:
+        try:
+            with os.scandir(directory or '.') as entries:
+                existing.update(f"{directory}/{entry.name}" if directory else entry.name for entry in entries)
+        except OSError:
+            pass
+    
     for file_path, description in all_files:
-        if os.path.exists(file_path):
+        if file_path in existing:
             results.append((file_path, True, f"✅ {description}"))
         else:
             results.append((file_path, False, f"❌ {description} - File not found"))
@@ -141,7 +191,7 @@ def test_configuration() -> List[Tuple[str, bool, str]]:
     """Test configuration setup"""
     results = []
     
-    print("\n⚙️ Testing Configuration...")
+    _log("\n⚙️ Testing Configuration...")
     
     try:
         from config.settings import settings
@@ -188,7 +238,7 @@ def test_environment() -> List[Tuple[str, bool, str]]:
     """Test environment setup"""
     results = []
     
-    print("\n🌍 Testing Environment...")
+    _log("\n🌍 Testing Environment...")
     
     # Check Python version
     python_version = sys.version_info
@@ -229,8 +279,9 @@ def test_pages() -> List[Tuple[str, bool, str]]:
     """Test page imports and basic structure"""
     results = []
     
-    print("\n📄 Testing Page Modules...")
+    _log("\n📄 Testing Page Modules...")
     
+    find_spec = importlib.util.find_spec
     pages = [
         'pages.01_🏠_User_Dashboard',
         'pages.02_👤_Profile_Settings', 
@@ -245,7 +296,7 @@ def test_pages() -> List[Tuple[str, bool, str]]:
             module_name = page.replace('/', '.').replace('.py', '')
             
             # Try to import the module
-            spec = importlib.util.find_spec(module_name)
+            spec = find_spec(module_name)
             if spec is not None:
                 results.append((page, True, f"✅ {page.split('.')[-1]} page"))
             else:
@@ -261,19 +312,35 @@ def run_all_tests() -> Dict[str, List[Tuple[str, bool, str]]]:
     print("🚀 Enhanced Streamlit User Management System - Setup Validation")
     print("=" * 70)
     
-    test_results = {
-        'imports': test_imports(),
-        'components': test_components(),
-        'file_structure': test_file_structure(),
-        'configuration': test_configuration(),
-        'environment': test_environment(),
-        'pages': test_pages()
+    tests = {
+        'imports': test_imports,
+        'components': test_components,
+        'file_structure': test_file_structure,
+        'configuration': test_configuration,
+        'environment': test_environment,
+        'pages': test_pages
     }
     
+    # Checks that import packages run one after another, since concurrent
+    # imports race inside package init; the filesystem-only checks run in
+    # parallel. Buffered output is flushed in the original order at the end
+    import_checks = ('imports', 'components', 'configuration')
+    outcomes = {name: _run_buffered(tests[name]) for name in import_checks}
+    light_checks = [name for name in tests if name not in import_checks]
+    with ThreadPoolExecutor(max_workers=len(light_checks)) as executor:
+        futures = {name: executor.submit(_run_buffered, tests[name]) for name in light_checks}
+        outcomes.update({name: future.result() for name, future in futures.items()})
+    
+    test_results = {}
+    for name in tests:
+        test_results[name], lines = outcomes[name]
+        for line in lines:
+            print(line)
+    
     return test_results
 
-def print_summary(test_results: Dict[str, List[Tuple[str, bool, str]]]):
-    """Print test summary"""
+def print_summary(test_results: Dict[str, List[Tuple[str, bool, str]]]) -> int:
+    """Print test summary and return the number of critical failures"""
     
     print("\n" + "=" * 70)
     print("📊 TEST SUMMARY")
@@ -283,27 +350,34 @@ def print_summary(test_results: Dict[str, List[Tuple[str, bool, str]]]):
     passed_tests = 0
     failed_tests = 0
     warnings = 0
+    critical_failures = 0
     
     for category, results in test_results.items():
-        category_passed = sum(1 for _, success, _ in results if success)
+        # Count and collect failed/warning lines in a single pass
+        category_passed = 0
+        details = []
+        for name, success, message in results:
+            category_passed += success
+            if "⚠️" in message:
+                warnings += 1
+                details.append(f"   ⚠️  {message}")
+            elif not success:
+                critical_failures += 1
+                details.append(f"   ❌ {message}")
+        
         category_total = len(results)
         category_failed = category_total - category_passed
-        category_warnings = sum(1 for _, _, msg in results if "⚠️" in msg)
         
         total_tests += category_total
         passed_tests += category_passed
         failed_tests += category_failed
-        warnings += category_warnings
         
         status_icon = "✅" if category_failed == 0 else "❌"
         print(f"{status_icon} {category.upper()}: {category_passed}/{category_total} passed")
         
         # Show failed tests
-        for name, success, message in results:
-            if not success and "⚠️" not in message:
-                print(f"   ❌ {message}")
-            elif "⚠️" in message:
-                print(f"   ⚠️  {message}")
+        for line in details:
+            print(line)
     
     print("\n" + "-" * 70)
     print(f"📈 OVERALL RESULTS:")
@@ -325,19 +399,16 @@ def print_summary(test_results: Dict[str, List[Tuple[str, bool, str]]]):
         print("   • Copy environment file: cp .env.example .env")
         print("   • Configure Supabase credentials in .env")
         print("   • Ensure all files are in the correct locations")
+    
+    return critical_failures
 
 def main():
     """Main test execution"""
     try:
         test_results = run_all_tests()
-        print_summary(test_results)
+        failed_count = print_summary(test_results)
         
         # Return appropriate exit code
-        failed_count = sum(
-            sum(1 for _, success, msg in results if not success and "⚠️" not in msg)
-            for results in test_results.values()
-        )
-        
         sys.exit(0 if failed_count == 0 else 1)
         
     except KeyboardInterrupt:
@@ -0,0 +1,29 @@
+"""Tests for components.utils"""
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("streamlit")
+
+from datetime import datetime, timezone
+
+from components.utils import calculate_activity_scores
+
+NOW = datetime(2024, 6, 10, 12, 0, 0, tzinfo=timezone.utc)
+
+def test_activity_scores_mixed_iso8601_offsets():
+    """'Z' and fractional '+00:00' timestamps in one batch both parse"""
+    scores = calculate_activity_scores([
+        "2024-06-10T08:00:00Z",
+        "2024-06-09T08:00:00.123456+00:00",
+        "2024-06-05T11:00:00Z",
+        "2024-05-20T11:00:00.123456+00:00",
+    ], now=NOW)
+    
+    assert list(scores) == ["Today", "Yesterday", "5 days ago", "3 weeks ago"]
+
+def test_activity_scores_missing_and_invalid():
+    """Empty values read as never signed in, unparseable ones as unknown"""
+    scores = calculate_activity_scores([None, "", "not a date", "2024-06-10T08:00:00Z"], now=NOW)
+    
+    assert list(scores) == ["Never", "Never", "Unknown", "Today"]